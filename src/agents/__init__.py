@@ -1,11 +1,32 @@
 """AI agents for infrastructure analysis and documentation."""
 
-from .infrastructure_agent import InfrastructureAgent
-from .documentation_agent import DocumentationAgent
-from .monitoring_agent import MonitoringAgent
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .infrastructure_agent import InfrastructureAgent
+    from .documentation_agent import DocumentationAgent
+    from .monitoring_agent import MonitoringAgent
+
+# Agents are imported on first access so that using one agent does not pay
+# for the dependencies of the others (e.g. discovery scanners, jinja2)
+_LAZY_IMPORTS = {
+    "InfrastructureAgent": ".infrastructure_agent",
+    "DocumentationAgent": ".documentation_agent",
+    "MonitoringAgent": ".monitoring_agent",
+}
 
 __all__ = [
     "InfrastructureAgent",
     "DocumentationAgent",
     "MonitoringAgent",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
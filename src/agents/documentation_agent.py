@@ -1,18 +1,59 @@
 """Documentation agent for generating infrastructure documentation."""
 
-import json
+import asyncio
 from pathlib import Path
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
+import aiofiles
 import httpx
-from jinja2 import Environment, FileSystemLoader, BaseLoader
+import orjson
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined
 
 from ..config import settings
-from ..utils import get_logger
+from ..utils import get_logger, LLMDispatcher, ResponseCache
 
 logger = get_logger(__name__)
 
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+# Shared template environment: templates are parsed and compiled once per
+# process, and the compiled bytecode is reused across runs. It is created on
+# first render so that importing the agent does not touch the filesystem.
+_JINJA_ENV: Optional[Environment] = None
+
+
+def _get_jinja_env() -> Environment:
+    global _JINJA_ENV
+    if _JINJA_ENV is None:
+        bytecode_cache = None
+        try:
+            settings.jinja_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(directory=str(settings.jinja_cache_dir))
+        except OSError as e:
+            logger.warning(f"Template bytecode cache disabled: {e}")
+        _JINJA_ENV = Environment(
+            loader=FileSystemLoader(str(TEMPLATES_DIR)),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            undefined=StrictUndefined,
+        )
+    return _JINJA_ENV
+
+
+def render_template(name: str, **context: Any) -> str:
+    """Render a template from the agent templates directory."""
+    return _get_jinja_env().get_template(name).render(**context)
+
+
+def _compact_json(obj: Any) -> str:
+    """Encode prompt data as compact JSON (indentation only costs tokens)."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class DocumentationAgent:
     """AI agent for generating infrastructure documentation."""
@@ -28,31 +69,108 @@ Your role is to create clear, comprehensive documentation including:
 Use clear, professional language. Include diagrams in ASCII or Mermaid format when helpful.
 Structure documentation with proper headings and sections."""
 
+    # Maximum number of servers embedded in the inventory prompt
+    MAX_PROMPT_SERVERS = 20
+
+    # Runbook subsections and the procedures each one covers
+    RUNBOOK_SECTIONS = [
+        ("Common Operations", [
+            "Server health check procedure",
+            "Service restart procedures",
+            "Log checking commands",
+            "Resource monitoring",
+        ]),
+        ("Incident Response", [
+            "High CPU usage response",
+            "High memory usage response",
+            "Disk space issues",
+            "Service outage response",
+        ]),
+        ("Maintenance", [
+            "System updates procedure",
+            "Docker image updates",
+            "Database maintenance",
+            "Certificate renewal",
+        ]),
+        ("Backup & Recovery", [
+            "Backup verification",
+            "Restore procedures",
+            "Disaster recovery steps",
+        ]),
+    ]
+
     def __init__(self):
         self.ollama_host = settings.ollama_host
         self.model = settings.ollama_model
         self.output_dir = settings.reports_dir
+        self._dispatcher = LLMDispatcher(settings.ollama_concurrency)
+        self._client: httpx.AsyncClient | None = None
+        self._client_lock = asyncio.Lock()
+        self._cache = ResponseCache(settings.llm_cache_dir, ttl=settings.llm_cache_ttl)
+        self._runbook_memo = ResponseCache(settings.llm_cache_dir, ttl=settings.runbook_memo_ttl)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        async with self._client_lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.AsyncClient(
+                    timeout=180,
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def __aenter__(self):
+        return self
 
-    async def _call_ollama(self, prompt: str, system: str = None) -> str:
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _call_ollama(
+        self, prompt: str, system: str = None, priority: int = LLMDispatcher.BATCH
+    ) -> str:
         """Call Ollama API."""
         system = system or self.SYSTEM_PROMPT
 
-        async with httpx.AsyncClient(timeout=180) as client:
+        cache_key = ResponseCache.make_key(self.model, system, prompt)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "stream": True,
+            "options": {"temperature": 0.3},
+        }
+
+        client = await self._get_client()
+        async with self._dispatcher.slot(priority):
             try:
-                response = await client.post(
-                    f"{self.ollama_host}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system},
-                            {"role": "user", "content": prompt},
-                        ],
-                        "stream": False,
-                        "options": {"temperature": 0.3},
-                    },
-                )
-                response.raise_for_status()
-                return response.json().get("message", {}).get("content", "")
+                parts = []
+                async with client.stream(
+                    "POST", f"{self.ollama_host}/api/chat", json=payload
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = orjson.loads(line)
+                        parts.append(chunk.get("message", {}).get("content", ""))
+                        if chunk.get("done"):
+                            break
+
+                content = "".join(parts)
+                self._cache.set(cache_key, content)
+                return content
             except Exception as e:
                 logger.error(f"Ollama call failed: {e}")
                 return ""
@@ -63,227 +181,138 @@ Structure documentation with proper headings and sections."""
         """Generate comprehensive infrastructure documentation."""
         logger.info("Generating full infrastructure documentation...")
 
-        sections = []
-
-        # Title and overview
-        sections.append(await self._generate_overview(infrastructure_data))
-
-        # Network documentation
-        sections.append(await self._generate_network_docs(infrastructure_data))
-
-        # Server inventory
-        sections.append(await self._generate_server_inventory(infrastructure_data))
-
-        # Docker/Container documentation
-        sections.append(await self._generate_docker_docs(infrastructure_data))
+        payloads = self._encode_payloads(infrastructure_data)
 
-        # Database documentation
-        sections.append(await self._generate_database_docs(infrastructure_data))
-
-        # Storage documentation
-        sections.append(await self._generate_storage_docs(infrastructure_data))
-
-        # Security documentation
-        sections.append(await self._generate_security_docs(infrastructure_data))
-
-        # Operational runbooks
-        sections.append(await self._generate_runbooks(infrastructure_data))
-
-        # Combine all sections
-        full_doc = "\n\n---\n\n".join(sections)
-
-        # Save to file
-        if output_path:
-            output_path.write_text(full_doc)
-            logger.info(f"Documentation saved to {output_path}")
-        else:
-            default_path = self.output_dir / f"infrastructure_docs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        if not output_path:
+            output_path = self.output_dir / f"infrastructure_docs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
             self.output_dir.mkdir(parents=True, exist_ok=True)
-            default_path.write_text(full_doc)
-            logger.info(f"Documentation saved to {default_path}")
 
-        return full_doc
+        # Sections are independent Ollama round-trips, so generate them concurrently
+        section_coros = [
+            self._generate_overview(infrastructure_data),
+            self._generate_network_docs(infrastructure_data, payloads),
+            self._generate_server_inventory(infrastructure_data, payloads),
+            self._generate_docker_docs(infrastructure_data, payloads),
+            self._generate_database_docs(infrastructure_data, payloads),
+            self._generate_storage_docs(infrastructure_data, payloads),
+            self._generate_security_docs(infrastructure_data, payloads),
+            self._generate_runbooks(infrastructure_data),
+        ]
+
+        async def indexed(index: int, coro) -> tuple[int, Any]:
+            try:
+                return index, await coro
+            except Exception as e:
+                return index, e
+
+        sections: list[Optional[str]] = [None] * len(section_coros)
+        written = 0
+
+        # Write each section as soon as it and every section before it are done,
+        # so the file fills in document order while later sections generate
+        async with aiofiles.open(output_path, "w") as f:
+            for next_done in asyncio.as_completed(
+                [indexed(i, coro) for i, coro in enumerate(section_coros)]
+            ):
+                index, result = await next_done
+                if isinstance(result, Exception):
+                    logger.error(f"Section generation failed: {result}")
+                    result = "*Section generation failed.*"
+                sections[index] = result
+
+                while written < len(sections) and sections[written] is not None:
+                    if written:
+                        await f.write(SECTION_SEPARATOR)
+                    await f.write(sections[written])
+                    written += 1
+                await f.flush()
+
+        logger.info(f"Documentation saved to {output_path}")
+
+        return SECTION_SEPARATOR.join(sections)
+
+    def _encode_payloads(self, data: dict) -> dict[str, str]:
+        """Encode the data embedded in section prompts once per document."""
+        return {
+            "networks": _compact_json(data.get("networks", [])),
+            "servers": _compact_json(data.get("servers", [])[:self.MAX_PROMPT_SERVERS]),
+            "docker": _compact_json(data.get("docker", {})),
+            "databases": _compact_json(data.get("databases", [])),
+            "storage": _compact_json(data.get("storage", {})),
+            "security_findings": _compact_json(data.get("security_findings", [])),
+            "recommendations": _compact_json(data.get("recommendations", [])),
+        }
 
     async def _generate_overview(self, data: dict) -> str:
         """Generate infrastructure overview section."""
-        prompt = f"""Generate an executive overview section for this infrastructure documentation.
-
-Infrastructure Data:
-- Total Servers: {len(data.get('servers', []))}
-- Networks: {len(data.get('networks', []))}
-- Docker Hosts: {len(data.get('docker', {}))}
-- Databases: {len(data.get('databases', []))}
-- Health Score: {data.get('health_score', 'N/A')}
-
-Summary from analysis:
-{data.get('summary', 'No summary available')}
-
-Create a professional overview section with:
-1. Title: "# Sidra Production Infrastructure Documentation"
-2. Executive summary
-3. Quick facts table
-4. Architecture diagram (ASCII or description)
-5. Table of contents
-
-Use markdown formatting."""
+        prompt = render_template(
+            "prompts/overview.j2",
+            server_count=len(data.get("servers", [])),
+            network_count=len(data.get("networks", [])),
+            docker_host_count=len(data.get("docker", {})),
+            database_count=len(data.get("databases", [])),
+            health_score=data.get("health_score", "N/A"),
+            summary=data.get("summary", "No summary available"),
+        )
 
         return await self._call_ollama(prompt)
 
-    async def _generate_network_docs(self, data: dict) -> str:
+    async def _generate_network_docs(self, data: dict, payloads: dict[str, str]) -> str:
         """Generate network documentation."""
-        networks = data.get("networks", [])
-
-        prompt = f"""Generate network documentation for these networks:
-
-{json.dumps(networks, indent=2)}
-
-Include:
-## Network Architecture
-
-1. Network segments and their purposes
-2. IP addressing scheme table
-3. Key hosts in each network
-4. Network diagram (ASCII)
-5. Firewall rules summary (if available)
-6. VPN configuration
+        if not data.get("networks"):
+            return "## Network Architecture\n\nNo networks detected."
 
-Use markdown formatting with tables."""
+        prompt = render_template("prompts/networks.j2", payload=payloads["networks"])
 
         return await self._call_ollama(prompt)
 
-    async def _generate_server_inventory(self, data: dict) -> str:
+    async def _generate_server_inventory(self, data: dict, payloads: dict[str, str]) -> str:
         """Generate server inventory documentation."""
-        servers = data.get("servers", [])
-
-        prompt = f"""Generate a server inventory document for these servers:
-
-{json.dumps(servers[:20], indent=2)}
-
-Include:
-## Server Inventory
-
-1. Server summary table with:
-   - Hostname
-   - IP Address
-   - OS
-   - CPU/Memory/Disk
-   - Role/Purpose
+        if not data.get("servers"):
+            return "## Server Inventory\n\nNo servers detected."
 
-2. Detailed specifications for each server
-3. Resource utilization summary
-4. Server roles and responsibilities
-
-Use markdown tables for clarity."""
+        prompt = render_template("prompts/server_inventory.j2", payload=payloads["servers"])
 
         return await self._call_ollama(prompt)
 
-    async def _generate_docker_docs(self, data: dict) -> str:
+    async def _generate_docker_docs(self, data: dict, payloads: dict[str, str]) -> str:
         """Generate Docker/container documentation."""
         docker_data = data.get("docker", {})
 
         if not docker_data:
             return "## Container Infrastructure\n\nNo Docker/container infrastructure detected."
 
-        prompt = f"""Generate Docker infrastructure documentation:
-
-{json.dumps(docker_data, indent=2)}
-
-Include:
-## Container Infrastructure
-
-1. Docker Swarm overview (if applicable)
-   - Manager nodes
-   - Worker nodes
-   - Services deployed
-
-2. Container inventory table
-3. Stack/Service relationships
-4. Network configuration
-5. Volume mappings
-6. Scaling configuration
-
-Use markdown formatting."""
+        prompt = render_template("prompts/docker.j2", payload=payloads["docker"])
 
         return await self._call_ollama(prompt)
 
-    async def _generate_database_docs(self, data: dict) -> str:
+    async def _generate_database_docs(self, data: dict, payloads: dict[str, str]) -> str:
         """Generate database documentation."""
         databases = data.get("databases", [])
 
         if not databases:
             return "## Database Infrastructure\n\nNo databases detected."
 
-        prompt = f"""Generate database infrastructure documentation:
-
-{json.dumps(databases, indent=2)}
-
-Include:
-## Database Infrastructure
-
-1. Database summary table
-2. Connection details (without passwords)
-3. Replication configuration
-4. Backup strategy (recommended)
-5. Database schemas/tables (if available)
-6. Access patterns
-
-Use markdown formatting."""
+        prompt = render_template("prompts/databases.j2", payload=payloads["databases"])
 
         return await self._call_ollama(prompt)
 
-    async def _generate_storage_docs(self, data: dict) -> str:
+    async def _generate_storage_docs(self, data: dict, payloads: dict[str, str]) -> str:
         """Generate storage documentation."""
-        storage = data.get("storage", {})
+        if not data.get("storage"):
+            return "## Storage Infrastructure\n\nNo storage detected."
 
-        prompt = f"""Generate storage infrastructure documentation:
-
-{json.dumps(storage, indent=2)}
-
-Include:
-## Storage Infrastructure
-
-1. Storage summary
-   - Total capacity
-   - Usage statistics
-   - Storage types (local, GlusterFS, NFS)
-
-2. GlusterFS configuration (if present)
-   - Volumes
-   - Bricks
-   - Replication
-
-3. Mount points and mappings
-4. Backup locations
-5. Storage growth projections
-
-Use markdown formatting."""
+        prompt = render_template("prompts/storage.j2", payload=payloads["storage"])
 
         return await self._call_ollama(prompt)
 
-    async def _generate_security_docs(self, data: dict) -> str:
+    async def _generate_security_docs(self, data: dict, payloads: dict[str, str]) -> str:
         """Generate security documentation."""
-        security = data.get("security_findings", [])
-        recommendations = data.get("recommendations", [])
-
-        prompt = f"""Generate security documentation:
-
-Security Findings:
-{json.dumps(security, indent=2)}
-
-Recommendations:
-{json.dumps(recommendations, indent=2)}
-
-Include:
-## Security Assessment
-
-1. Security overview and health score
-2. Findings table with severity
-3. Detailed findings with remediation steps
-4. Security recommendations
-5. Compliance considerations
-6. Next steps
-
-Use markdown formatting with severity indicators."""
+        prompt = render_template(
+            "prompts/security.j2",
+            findings=payloads["security_findings"],
+            recommendations=payloads["recommendations"],
+        )
 
         return await self._call_ollama(prompt)
 
@@ -292,80 +321,69 @@ Use markdown formatting with severity indicators."""
         servers = data.get("servers", [])
         docker = data.get("docker", {})
 
-        prompt = f"""Generate operational runbooks for this infrastructure:
-
-Servers: {len(servers)}
-Docker hosts: {len(docker)}
-Services: Various web apps, APIs, databases
-
-Include:
-## Operational Runbooks
-
-### Common Operations
-1. Server health check procedure
-2. Service restart procedures
-3. Log checking commands
-4. Resource monitoring
+        if not servers and not docker:
+            return "## Operational Runbooks\n\nNo servers or Docker hosts detected."
 
-### Incident Response
-1. High CPU usage response
-2. High memory usage response
-3. Disk space issues
-4. Service outage response
+        sections = await asyncio.gather(
+            *[
+                self._generate_runbook_section(title, items, has_docker=bool(docker))
+                for title, items in self.RUNBOOK_SECTIONS
+            ]
+        )
 
-### Maintenance
-1. System updates procedure
-2. Docker image updates
-3. Database maintenance
-4. Certificate renewal
+        return "## Operational Runbooks\n\n" + "\n\n".join(sections)
 
-### Backup & Recovery
-1. Backup verification
-2. Restore procedures
-3. Disaster recovery steps
-
-Use code blocks for commands."""
-
-        return await self._call_ollama(prompt)
+    async def _generate_runbook_section(
+        self, title: str, items: list[str], has_docker: bool
+    ) -> str:
+        """Generate one runbook subsection, reusing a memoized copy when available.
+
+        Procedures do not depend on fleet size, so the memo is keyed only on the
+        subsection and whether Docker is present and outlives the response cache.
+        """
+        if not has_docker:
+            items = [item for item in items if "Docker" not in item]
+
+        memo_key = ResponseCache.make_key("runbook", self.model, title, *items)
+        memoized = self._runbook_memo.get(memo_key)
+        if memoized is not None:
+            return memoized
+
+        prompt = render_template(
+            "prompts/runbook_section.j2",
+            title=title,
+            items=items,
+            has_docker=has_docker,
+        )
+        content = await self._call_ollama(prompt)
+        self._runbook_memo.set(memo_key, content)
+        return content
 
     async def generate_quick_report(self, host_data: dict) -> str:
         """Generate a quick report for a single host."""
-        prompt = f"""Generate a quick server report:
-
-{json.dumps(host_data, indent=2)}
+        prompt = render_template("prompts/quick_report.j2", payload=_compact_json(host_data))
 
-Include:
-1. Server summary (1 paragraph)
-2. Key specs table
-3. Health status
-4. Active services
-5. Any concerns
-
-Keep it concise (under 300 words). Use markdown."""
-
-        return await self._call_ollama(prompt)
+        return await self._call_ollama(prompt, priority=LLMDispatcher.INTERACTIVE)
 
     async def generate_daily_report(self, infrastructure_data: dict) -> str:
         """Generate a daily infrastructure report."""
-        prompt = f"""Generate a daily infrastructure status report:
-
-Date: {datetime.now().strftime('%Y-%m-%d')}
-
-Infrastructure Summary:
-- Servers: {len(infrastructure_data.get('servers', []))}
-- Health Score: {infrastructure_data.get('health_score', 'N/A')}
-
-Server Status:
-{json.dumps([{'hostname': s.get('hostname'), 'cpu': s.get('cpu', {}).get('usage_percent'), 'memory': s.get('memory', {}).get('usage_percent')} for s in infrastructure_data.get('servers', [])], indent=2)}
-
-Security Findings: {len(infrastructure_data.get('security_findings', []))}
-
-Create a concise daily report with:
-1. Overall status (Green/Yellow/Red)
-2. Key metrics summary
-3. Alerts and warnings
-4. Action items
-
-Use markdown formatting. Keep it under 500 words."""
+        servers = infrastructure_data.get("servers", [])
+        server_status = _compact_json([
+            {
+                "hostname": s.get("hostname"),
+                "cpu": s.get("cpu", {}).get("usage_percent"),
+                "memory": s.get("memory", {}).get("usage_percent"),
+            }
+            for s in servers
+        ])
+
+        prompt = render_template(
+            "prompts/daily_report.j2",
+            date=datetime.now().strftime("%Y-%m-%d"),
+            server_count=len(servers),
+            health_score=infrastructure_data.get("health_score", "N/A"),
+            server_status=server_status,
+            security_finding_count=len(infrastructure_data.get("security_findings", [])),
+        )
 
         return await self._call_ollama(prompt)
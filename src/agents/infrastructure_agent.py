@@ -1,15 +1,16 @@
 """AI agent for infrastructure analysis using Ollama."""
 
-import json
 import asyncio
+import re
 from dataclasses import dataclass, field
 from typing import Any, Optional
 from datetime import datetime
 
 import httpx
+import orjson
 
 from ..config import settings
-from ..utils import get_logger
+from ..utils import get_logger, ResponseCache
 from ..discovery import (
     NetworkScanner,
     ServerDiscovery,
@@ -21,6 +22,9 @@ from ..discovery import (
 
 logger = get_logger(__name__)
 
+# Markdown code fence around a JSON reply, e.g. ```json ... ``` or ```JSON ... ```
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
 
 @dataclass
 class InfrastructureAnalysis:
@@ -63,30 +67,74 @@ Always provide actionable recommendations."""
         self.ollama_host = settings.ollama_host
         self.model = settings.ollama_model
         self.network_scanner = NetworkScanner()
+        self._client: httpx.AsyncClient | None = None
+        self._client_lock = asyncio.Lock()
+        self._cache = ResponseCache(settings.llm_cache_dir, ttl=settings.llm_cache_ttl)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        async with self._client_lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.AsyncClient(
+                    timeout=120,
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def __aenter__(self):
+        return self
 
-    async def _call_ollama(self, prompt: str, system: str = None) -> str:
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _call_ollama(self, prompt: str, system: str = None, format: str = None) -> str:
         """Call Ollama API for analysis."""
         system = system or self.SYSTEM_PROMPT
 
-        async with httpx.AsyncClient(timeout=120) as client:
-            try:
-                response = await client.post(
-                    f"{self.ollama_host}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system},
-                            {"role": "user", "content": prompt},
-                        ],
-                        "stream": False,
-                        "options": {"temperature": 0.3},
-                    },
-                )
+        cache_key = ResponseCache.make_key(self.model, system, prompt, format or "")
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "stream": True,
+            "options": {"temperature": 0.3},
+        }
+        if format:
+            payload["format"] = format
+
+        client = await self._get_client()
+        try:
+            parts = []
+            async with client.stream(
+                "POST", f"{self.ollama_host}/api/chat", json=payload
+            ) as response:
                 response.raise_for_status()
-                return response.json().get("message", {}).get("content", "")
-            except Exception as e:
-                logger.error(f"Ollama call failed: {e}")
-                return ""
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    parts.append(chunk.get("message", {}).get("content", ""))
+                    if chunk.get("done"):
+                        break
+
+            content = "".join(parts)
+            self._cache.set(cache_key, content)
+            return content
+        except Exception as e:
+            logger.error(f"Ollama call failed: {e}")
+            return ""
 
     async def full_discovery(self) -> InfrastructureAnalysis:
         """Perform full infrastructure discovery and analysis."""
@@ -95,11 +143,9 @@ Always provide actionable recommendations."""
 
         # Discover networks
         logger.info("Scanning networks...")
-        networks_data = []
         for cidr in settings.networks_list:
             try:
                 network_info = await self.network_scanner.scan_network(cidr)
-                networks_data.append(self.network_scanner.to_dict(network_info))
                 analysis.networks.append(self.network_scanner.to_dict(network_info))
             except Exception as e:
                 logger.error(f"Network scan failed for {cidr}: {e}")
@@ -113,12 +159,30 @@ Always provide actionable recommendations."""
 
         logger.info(f"Found {len(accessible_hosts)} accessible hosts")
 
-        # Discover each host
-        for host_ip in accessible_hosts[:20]:  # Limit to 20 hosts
-            try:
-                await self._discover_host(host_ip, analysis)
-            except Exception as e:
-                logger.error(f"Host discovery failed for {host_ip}: {e}")
+        # Discover hosts concurrently, each into its own partial result so the
+        # merged analysis keeps a stable host order
+        semaphore = asyncio.Semaphore(settings.discovery_threads)
+
+        async def discover_one(host_ip: str) -> InfrastructureAnalysis:
+            host_analysis = InfrastructureAnalysis()
+            async with semaphore:
+                await self._discover_host(host_ip, host_analysis)
+            return host_analysis
+
+        hosts = accessible_hosts[:20]  # Limit to 20 hosts
+        results = await asyncio.gather(
+            *[discover_one(host_ip) for host_ip in hosts],
+            return_exceptions=True,
+        )
+        for host_ip, result in zip(hosts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Host discovery failed for {host_ip}: {result}")
+                continue
+            analysis.servers.extend(result.servers)
+            analysis.docker.update(result.docker)
+            analysis.databases.extend(result.databases)
+            analysis.storage.update(result.storage)
+            analysis.services.extend(result.services)
 
         # Analyze with AI
         await self._analyze_infrastructure(analysis)
@@ -140,32 +204,39 @@ Always provide actionable recommendations."""
             return
 
         try:
-            # Server discovery
+            # The discoveries share one SSH connection; asyncssh multiplexes
+            # their commands over separate channels
             server_discovery = ServerDiscovery(ssh)
-            server_info = await server_discovery.discover()
+            docker_discovery = DockerDiscovery(ssh)
+            db_discovery = DatabaseDiscovery(ssh)
+            storage_discovery = StorageDiscovery(ssh)
+            service_discovery = ServiceDiscovery(ssh)
+
+            (
+                server_info,
+                docker_info,
+                db_report,
+                storage_report,
+                service_report,
+            ) = await asyncio.gather(
+                server_discovery.discover(),
+                docker_discovery.discover(),
+                db_discovery.discover(),
+                storage_discovery.discover(),
+                service_discovery.discover(),
+            )
+
             analysis.servers.append(server_discovery.to_dict(server_info))
 
-            # Docker discovery
-            docker_discovery = DockerDiscovery(ssh)
-            docker_info = await docker_discovery.discover()
             if docker_info.version:
                 analysis.docker[host_ip] = docker_discovery.to_dict(docker_info)
 
-            # Database discovery
-            db_discovery = DatabaseDiscovery(ssh)
-            db_report = await db_discovery.discover()
             db_data = db_discovery.to_dict(db_report)
             if db_data.get("databases"):
                 analysis.databases.append(db_data)
 
-            # Storage discovery
-            storage_discovery = StorageDiscovery(ssh)
-            storage_report = await storage_discovery.discover()
             analysis.storage[host_ip] = storage_discovery.to_dict(storage_report)
 
-            # Services discovery
-            service_discovery = ServiceDiscovery(ssh)
-            service_report = await service_discovery.discover()
             analysis.services.append(service_discovery.to_dict(service_report))
 
         finally:
@@ -192,13 +263,58 @@ Always provide actionable recommendations."""
             ],
             "docker_hosts": list(analysis.docker.keys()),
             "databases": analysis.databases,
-            "has_glusterfs": any("glusterfs" in str(s) for s in analysis.storage.values()),
+            # StorageDiscovery.to_dict only emits a "glusterfs" section when found
+            "has_glusterfs": any("glusterfs" in s for s in analysis.storage.values()),
         }
 
+        # Encode once; every analysis prompt embeds the same summary
+        summary_json = orjson.dumps(data_summary, option=orjson.OPT_INDENT_2).decode()
+
+        # Ask for all four analyses in one structured response; fall back to
+        # separate prompts if the model does not return the expected object
+        combined_prompt = f"""Analyze this infrastructure data:
+
+{summary_json}
+
+Return a JSON object with exactly these fields:
+- "summary": a concise summary (under 500 words) covering the overview of the infrastructure, key services and applications, storage architecture, and network topology
+- "architecture_diagram": a simple ASCII architecture diagram showing the relationships between servers, Docker hosts, and databases
+- "security_findings": an array of objects with 'severity', 'finding', and 'recommendation' fields, covering default credentials in use, exposed services, missing security configurations, network segmentation issues, and backup and disaster recovery gaps
+- "recommendations": an array of 5-10 actionable recommendation strings focused on performance optimization, cost reduction, reliability improvements, security hardening, and operational efficiency
+
+Return ONLY valid JSON."""
+
+        combined_response = await self._call_ollama(combined_prompt, format="json")
+        try:
+            result = orjson.loads(combined_response)
+        except ValueError:
+            result = None
+
+        if (
+            isinstance(result, dict)
+            and isinstance(result.get("summary"), str)
+            and isinstance(result.get("security_findings"), list)
+            and isinstance(result.get("recommendations"), list)
+        ):
+            analysis.summary = result["summary"]
+            analysis.architecture_diagram = str(result.get("architecture_diagram", ""))
+            analysis.security_findings = result["security_findings"]
+            analysis.recommendations = [str(r) for r in result["recommendations"]]
+        else:
+            logger.warning("Structured analysis failed, falling back to separate prompts")
+            await self._analyze_separately(analysis, data_summary, summary_json)
+
+        # Calculate health score
+        analysis.health_score = await self._calculate_health_score(analysis)
+
+    async def _analyze_separately(
+        self, analysis: InfrastructureAnalysis, data_summary: dict, summary_json: str
+    ):
+        """Run the summary, diagram, security and recommendation prompts concurrently."""
         # Generate summary
         summary_prompt = f"""Analyze this infrastructure data and provide a concise summary:
 
-{json.dumps(data_summary, indent=2)}
+{summary_json}
 
 Include:
 1. Overview of the infrastructure
@@ -208,23 +324,19 @@ Include:
 
 Keep it under 500 words."""
 
-        analysis.summary = await self._call_ollama(summary_prompt)
-
         # Generate architecture diagram (ASCII)
         diagram_prompt = f"""Create a simple ASCII architecture diagram for this infrastructure:
 
-Servers: {json.dumps([s.get('hostname') for s in analysis.servers])}
-Docker hosts: {json.dumps(list(analysis.docker.keys()))}
-Databases: {json.dumps([d.get('host') for d in analysis.databases])}
+Servers: {orjson.dumps([s["hostname"] for s in data_summary["servers"]]).decode()}
+Docker hosts: {orjson.dumps(data_summary["docker_hosts"]).decode()}
+Databases: {orjson.dumps([d.get('host') for d in analysis.databases]).decode()}
 
 Create a simple ASCII diagram showing the relationships."""
 
-        analysis.architecture_diagram = await self._call_ollama(diagram_prompt)
-
         # Security analysis
         security_prompt = f"""Analyze this infrastructure for security issues:
 
-{json.dumps(data_summary, indent=2)}
+{summary_json}
 
 Look for:
 1. Default credentials in use
@@ -236,21 +348,10 @@ Look for:
 Return findings as a JSON array of objects with 'severity', 'finding', and 'recommendation' fields.
 Return ONLY valid JSON."""
 
-        security_response = await self._call_ollama(security_prompt)
-        try:
-            # Try to parse JSON from response
-            if "```" in security_response:
-                security_response = security_response.split("```")[1]
-                if security_response.startswith("json"):
-                    security_response = security_response[4:]
-            analysis.security_findings = json.loads(security_response)
-        except:
-            analysis.security_findings = [{"finding": security_response, "severity": "info"}]
-
         # Recommendations
         rec_prompt = f"""Based on this infrastructure analysis, provide 5-10 actionable recommendations:
 
-{json.dumps(data_summary, indent=2)}
+{summary_json}
 
 Focus on:
 1. Performance optimization
@@ -261,21 +362,40 @@ Focus on:
 
 Return as a simple list of recommendations."""
 
-        rec_response = await self._call_ollama(rec_prompt)
+        (
+            analysis.summary,
+            analysis.architecture_diagram,
+            security_response,
+            rec_response,
+        ) = await asyncio.gather(
+            self._call_ollama(summary_prompt),
+            self._call_ollama(diagram_prompt),
+            self._call_ollama(security_prompt),
+            self._call_ollama(rec_prompt),
+        )
+
+        # Parse JSON from the response, unwrapping a markdown fence if present
+        match = _FENCE_RE.search(security_response)
+        payload = match.group(1) if match else security_response.strip()
+        try:
+            analysis.security_findings = orjson.loads(payload)
+        except ValueError:
+            analysis.security_findings = [{"finding": security_response, "severity": "info"}]
+
         analysis.recommendations = [
             r.strip().lstrip("0123456789.-) ")
             for r in rec_response.split("\n")
             if r.strip() and len(r.strip()) > 10
         ]
 
-        # Calculate health score
-        analysis.health_score = await self._calculate_health_score(analysis)
+    # Health score deductions per security finding severity
+    SEVERITY_PENALTIES = {"critical": 15, "high": 10, "medium": 5}
 
     async def _calculate_health_score(self, analysis: InfrastructureAnalysis) -> int:
         """Calculate overall infrastructure health score (0-100)."""
         score = 100
 
-        # Deduct for high CPU usage
+        # Deduct for high CPU, memory and disk usage in one pass over servers
         for server in analysis.servers:
             cpu_usage = server.get("cpu", {}).get("usage_percent", 0)
             if cpu_usage > 80:
@@ -283,31 +403,23 @@ Return as a simple list of recommendations."""
             elif cpu_usage > 60:
                 score -= 2
 
-        # Deduct for high memory usage
-        for server in analysis.servers:
             mem_usage = server.get("memory", {}).get("usage_percent", 0)
             if mem_usage > 90:
                 score -= 10
             elif mem_usage > 80:
                 score -= 5
 
-        # Deduct for high disk usage
-        for server in analysis.servers:
             for disk in server.get("disks", []):
-                if disk.get("usage_percent", 0) > 90:
+                disk_usage = disk.get("usage_percent", 0)
+                if disk_usage > 90:
                     score -= 10
-                elif disk.get("usage_percent", 0) > 80:
+                elif disk_usage > 80:
                     score -= 5
 
         # Deduct for security findings
         for finding in analysis.security_findings:
             severity = finding.get("severity", "").lower()
-            if severity == "critical":
-                score -= 15
-            elif severity == "high":
-                score -= 10
-            elif severity == "medium":
-                score -= 5
+            score -= self.SEVERITY_PENALTIES.get(severity, 0)
 
         return max(0, min(100, score))
 
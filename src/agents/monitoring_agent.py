@@ -1,7 +1,11 @@
 """Monitoring agent for continuous infrastructure monitoring."""
 
 import asyncio
+import heapq
 import json
+import re
+import time
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Callable, Any
@@ -9,10 +13,16 @@ from typing import Optional, Callable, Any
 import httpx
 
 from ..config import settings
-from ..utils import get_logger, SSHClient, SSHCredentials, SSHConnectionPool
+from ..utils import get_logger, BurstableSemaphore, SSHClient, SSHCredentials, SSHConnectionPool
 
 logger = get_logger(__name__)
 
+# Parsing of MonitoringAgent.METRICS_COMMAND output
+_SECTION_SEPARATOR_RE = re.compile(r"^---$", re.MULTILINE)
+_NUMBER_RE = re.compile(r"\s*(\d+(?:[.,]\d+)?)")
+_NON_BLANK_LINE_RE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+_UNHEALTHY_RE = re.compile(r"\(unhealthy\)")
+
 
 @dataclass
 class Alert:
@@ -25,7 +35,12 @@ class Alert:
     threshold: float = 0.0
     message: str = ""
     created_at: datetime = field(default_factory=datetime.now)
+    created_monotonic: float = field(default_factory=time.monotonic)  # for age checks
     acknowledged: bool = False
+    created_at_iso: str = field(init=False)
+
+    def __post_init__(self):
+        self.created_at_iso = self.created_at.isoformat()
 
 
 @dataclass
@@ -42,6 +57,10 @@ class HealthCheck:
     services_up: int = 0
     services_down: int = 0
     last_check: datetime = field(default_factory=datetime.now)
+    last_check_iso: str = field(init=False)
+
+    def __post_init__(self):
+        self.last_check_iso = self.last_check.isoformat()
 
 
 class MonitoringAgent:
@@ -57,6 +76,23 @@ class MonitoringAgent:
         "disk_critical": 95,
     }
 
+    # (metric, HealthCheck attribute, warning key, critical key, label)
+    THRESHOLD_SPECS = (
+        ("cpu", "cpu_usage", "cpu_warning", "cpu_critical", "CPU"),
+        ("memory", "memory_usage", "memory_warning", "memory_critical", "memory"),
+        ("disk", "disk_usage", "disk_warning", "disk_critical", "disk"),
+    )
+
+    DOCKER_UNAVAILABLE = "__docker_unavailable__"
+
+    # CPU, memory, root disk usage and container statuses in a single command
+    METRICS_COMMAND = (
+        "top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1; echo ---; "
+        "free | grep Mem | awk '{print $3/$2 * 100}'; echo ---; "
+        "df / | tail -1 | awk '{print $5}' | tr -d '%'; echo ---; "
+        "docker ps --format '{{.Status}}' 2>/dev/null || echo " + DOCKER_UNAVAILABLE
+    )
+
     def __init__(
         self,
         hosts: list[str] = None,
@@ -67,9 +103,30 @@ class MonitoringAgent:
         self.interval = interval or settings.monitor_interval
         self.webhook_url = webhook_url or settings.alert_webhook_url
         self.ssh_pool = SSHConnectionPool()
+        # THRESHOLD_SPECS with the threshold values resolved to floats:
+        # (metric, attribute, warning, critical, label)
+        self._thresholds = tuple(
+            (metric, attr, float(self.THRESHOLDS[warning_key]),
+             float(self.THRESHOLDS[critical_key]), label)
+            for metric, attr, warning_key, critical_key, label in self.THRESHOLD_SPECS
+        )
+        # One long-lived connection per host, reused across monitoring ticks
+        self._clients: dict[str, SSHClient] = {}
+        # Bound concurrent checks so large host lists do not exhaust sockets
+        self._check_slots = BurstableSemaphore(
+            settings.max_concurrent_checks, settings.check_burst_limit
+        )
         self.alerts: list[Alert] = []
+        # Latest unacknowledged alert per (host, metric), used for dedup
+        self._active_by_key: dict[tuple[str, str], Alert] = {}
+        # Unacknowledged alert counts per severity
+        self._severity_counts: Counter = Counter()
         self.health_checks: dict[str, HealthCheck] = {}
+        # Number of hosts per status in health_checks
+        self._status_counts: Counter = Counter()
         self._running = False
+        # Shared client so webhook posts reuse warm connections
+        self._http: httpx.AsyncClient | None = None
         self._alert_callbacks: list[Callable[[Alert], None]] = []
 
     def add_hosts(self, hosts: list[str]):
@@ -85,6 +142,16 @@ class MonitoringAgent:
         logger.info(f"Starting monitoring for {len(self.hosts)} hosts")
         self._running = True
 
+        # Open connections up front so the first tick does not pay for them
+        async def connect(host: str):
+            async with self._check_slots:
+                await self._get_client(host)
+
+        await asyncio.gather(
+            *[connect(host) for host in self.hosts],
+            return_exceptions=True,
+        )
+
         while self._running:
             try:
                 await self._check_all_hosts()
@@ -98,149 +165,125 @@ class MonitoringAgent:
         """Stop the monitoring loop."""
         logger.info("Stopping monitoring")
         self._running = False
+        self._clients.clear()
         await self.ssh_pool.close_all()
+        if self._http and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=10,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._http
+
+    async def _get_client(self, host: str) -> Optional[SSHClient]:
+        """Get the pinned connection for a host, connecting on first use."""
+        client = self._clients.get(host)
+        if client is None:
+            client = await self.ssh_pool.try_connect(host)
+            if client:
+                self._clients[host] = client
+        return client
 
     async def check_host(self, host: str) -> HealthCheck:
         """Check health of a single host."""
+        async with self._check_slots:
+            check = await self._check_host(host)
+        # Alert as soon as this host is done rather than after the slowest one
+        await self._evaluate_thresholds(check)
+        return check
+
+    async def _check_host(self, host: str) -> HealthCheck:
         check = HealthCheck(host=host)
 
         try:
-            client = await self.ssh_pool.try_connect(host)
+            client = await self._get_client(host)
             if not client:
                 check.status = "unreachable"
                 return check
 
-            # CPU usage
-            result = await client.execute(
-                "top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1"
-            )
-            if result.success:
-                try:
-                    check.cpu_usage = float(result.stdout.strip().replace(",", "."))
-                except ValueError:
-                    pass
-
-            # Memory usage
-            result = await client.execute(
-                "free | grep Mem | awk '{print $3/$2 * 100}'"
-            )
-            if result.success:
-                try:
-                    check.memory_usage = float(result.stdout.strip())
-                except ValueError:
-                    pass
-
-            # Disk usage (root partition)
-            result = await client.execute(
-                "df / | tail -1 | awk '{print $5}' | tr -d '%'"
-            )
-            if result.success:
-                try:
-                    check.disk_usage = float(result.stdout.strip())
-                except ValueError:
-                    pass
-
-            # Docker status
-            result = await client.execute("docker ps --format '{{.Status}}' 2>/dev/null")
-            if result.success:
-                check.docker_running = True
-                statuses = result.stdout.strip().split("\n")
-                for status in statuses:
-                    if "healthy" in status.lower():
-                        check.containers_healthy += 1
-                    elif status and "unhealthy" in status.lower():
-                        check.containers_unhealthy += 1
-                    elif status:
-                        check.containers_healthy += 1  # Running but no health check
-
-            # Determine overall status
-            if check.cpu_usage >= self.THRESHOLDS["cpu_critical"] or \
-               check.memory_usage >= self.THRESHOLDS["memory_critical"] or \
-               check.disk_usage >= self.THRESHOLDS["disk_critical"]:
-                check.status = "unhealthy"
-            elif check.cpu_usage >= self.THRESHOLDS["cpu_warning"] or \
-                 check.memory_usage >= self.THRESHOLDS["memory_warning"] or \
-                 check.disk_usage >= self.THRESHOLDS["disk_warning"]:
+            # Collect all metrics in one round-trip; sections are separated by
+            # "---" lines in the order CPU, memory, disk, docker
+            result = await client.execute(self.METRICS_COMMAND)
+            if result.timed_out:
+                # A slow command (e.g. df on a hung mount) does not mean the
+                # connection is gone; keep the client and report degraded
+                logger.warning(f"Health check timed out for {host}: {result.stderr}")
                 check.status = "degraded"
+            elif result.exit_code == -1 and not result.stdout:
+                # Connection went away; reconnect on the next tick
+                self._clients.pop(host, None)
+                await client.disconnect()
+                check.status = "unreachable"
+                return check
             else:
-                check.status = "healthy"
+                self._apply_metrics(check, result.stdout)
 
         except Exception as e:
             logger.error(f"Health check failed for {host}: {e}")
             check.status = "error"
 
+        prev = self.health_checks.get(host)
+        if prev:
+            self._status_counts[prev.status] -= 1
+        self._status_counts[check.status] += 1
         self.health_checks[host] = check
         return check
 
+    def _apply_metrics(self, check: HealthCheck, output: str):
+        """Fill check from METRICS_COMMAND output and set its status."""
+        sections = _SECTION_SEPARATOR_RE.split(output)
+        for attr, text in zip(("cpu_usage", "memory_usage", "disk_usage"), sections):
+            match = _NUMBER_RE.match(text)
+            if match:
+                setattr(check, attr, float(match.group(1).replace(",", ".")))
+
+        # Docker status
+        docker = sections[3] if len(sections) >= 4 else ""
+        if len(sections) >= 4 and self.DOCKER_UNAVAILABLE not in docker:
+            check.docker_running = True
+            # Containers without a health check count as healthy
+            running = len(_NON_BLANK_LINE_RE.findall(docker))
+            check.containers_unhealthy = len(_UNHEALTHY_RE.findall(docker))
+            check.containers_healthy = running - check.containers_unhealthy
+
+        # Determine overall status
+        check.status = "healthy"
+        for _, attr, warning, critical, _ in self._thresholds:
+            value = getattr(check, attr)
+            if value >= critical:
+                check.status = "unhealthy"
+                break
+            if value >= warning:
+                check.status = "degraded"
+
     async def _check_all_hosts(self):
         """Check all monitored hosts."""
         tasks = [self.check_host(host) for host in self.hosts]
         await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Generate alerts based on checks
-        for host, check in self.health_checks.items():
-            await self._evaluate_thresholds(check)
-
     async def _evaluate_thresholds(self, check: HealthCheck):
         """Evaluate thresholds and generate alerts."""
-        # CPU alerts
-        if check.cpu_usage >= self.THRESHOLDS["cpu_critical"]:
-            await self._create_alert(
-                host=check.host,
-                severity="critical",
-                metric="cpu",
-                value=check.cpu_usage,
-                threshold=self.THRESHOLDS["cpu_critical"],
-                message=f"Critical CPU usage: {check.cpu_usage:.1f}%",
-            )
-        elif check.cpu_usage >= self.THRESHOLDS["cpu_warning"]:
-            await self._create_alert(
-                host=check.host,
-                severity="warning",
-                metric="cpu",
-                value=check.cpu_usage,
-                threshold=self.THRESHOLDS["cpu_warning"],
-                message=f"High CPU usage: {check.cpu_usage:.1f}%",
-            )
-
-        # Memory alerts
-        if check.memory_usage >= self.THRESHOLDS["memory_critical"]:
-            await self._create_alert(
-                host=check.host,
-                severity="critical",
-                metric="memory",
-                value=check.memory_usage,
-                threshold=self.THRESHOLDS["memory_critical"],
-                message=f"Critical memory usage: {check.memory_usage:.1f}%",
-            )
-        elif check.memory_usage >= self.THRESHOLDS["memory_warning"]:
-            await self._create_alert(
-                host=check.host,
-                severity="warning",
-                metric="memory",
-                value=check.memory_usage,
-                threshold=self.THRESHOLDS["memory_warning"],
-                message=f"High memory usage: {check.memory_usage:.1f}%",
-            )
+        for metric, attr, warning, critical, label in self._thresholds:
+            value = getattr(check, attr)
+            if value >= critical:
+                severity, threshold, level = "critical", critical, "Critical"
+            elif value >= warning:
+                severity, threshold, level = "warning", warning, "High"
+            else:
+                continue
 
-        # Disk alerts
-        if check.disk_usage >= self.THRESHOLDS["disk_critical"]:
-            await self._create_alert(
-                host=check.host,
-                severity="critical",
-                metric="disk",
-                value=check.disk_usage,
-                threshold=self.THRESHOLDS["disk_critical"],
-                message=f"Critical disk usage: {check.disk_usage:.1f}%",
-            )
-        elif check.disk_usage >= self.THRESHOLDS["disk_warning"]:
             await self._create_alert(
                 host=check.host,
-                severity="warning",
-                metric="disk",
-                value=check.disk_usage,
-                threshold=self.THRESHOLDS["disk_warning"],
-                message=f"High disk usage: {check.disk_usage:.1f}%",
+                severity=severity,
+                metric=metric,
+                value=value,
+                threshold=threshold,
+                message=f"{level} {label} usage: {value:.1f}%",
             )
 
         # Unreachable host alert
@@ -265,12 +308,11 @@ class MonitoringAgent:
     ):
         """Create a new alert."""
         # Check if similar alert already exists (within last 5 minutes)
-        for existing in self.alerts:
-            if (existing.host == host and
-                existing.metric == metric and
-                not existing.acknowledged and
-                (datetime.now() - existing.created_at).seconds < 300):
-                return  # Don't duplicate
+        existing = self._active_by_key.get((host, metric))
+        if (existing and
+            not existing.acknowledged and
+            time.monotonic() - existing.created_monotonic < 300):
+            return  # Don't duplicate
 
         alert = Alert(
             id=f"{host}-{metric}-{datetime.now().timestamp()}",
@@ -282,6 +324,8 @@ class MonitoringAgent:
             message=message,
         )
         self.alerts.append(alert)
+        self._active_by_key[(host, metric)] = alert
+        self._severity_counts[severity] += 1
         logger.warning(f"Alert: [{severity}] {message}")
 
         # Notify callbacks
@@ -296,33 +340,37 @@ class MonitoringAgent:
         if not self.webhook_url:
             return
 
-        unacknowledged = [a for a in self.alerts if not a.acknowledged]
-        if not unacknowledged:
+        if not self._active_by_key:
             return
 
-        # Group by severity
-        critical = [a for a in unacknowledged if a.severity == "critical"]
-        warning = [a for a in unacknowledged if a.severity == "warning"]
+        # Most urgent alerts first: critical before others, then newest
+        top = heapq.nlargest(
+            10,
+            self._active_by_key.values(),
+            key=lambda a: (a.severity == "critical", a.created_monotonic),
+        )
 
         # Send webhook
         payload = {
             "timestamp": datetime.now().isoformat(),
-            "summary": f"{len(critical)} critical, {len(warning)} warning alerts",
+            "summary": (
+                f"{self._severity_counts['critical']} critical, "
+                f"{self._severity_counts['warning']} warning alerts"
+            ),
             "alerts": [
                 {
                     "id": a.id,
                     "severity": a.severity,
                     "host": a.host,
                     "message": a.message,
-                    "created_at": a.created_at.isoformat(),
+                    "created_at": a.created_at_iso,
                 }
-                for a in unacknowledged[:10]
+                for a in top
             ],
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                await client.post(self.webhook_url, json=payload, timeout=10)
+            await self._get_http().post(self.webhook_url, json=payload)
         except Exception as e:
             logger.error(f"Failed to send webhook: {e}")
 
@@ -330,19 +378,19 @@ class MonitoringAgent:
         """Get a summary of monitoring status."""
         return {
             "hosts_monitored": len(self.hosts),
-            "hosts_healthy": sum(1 for h in self.health_checks.values() if h.status == "healthy"),
-            "hosts_degraded": sum(1 for h in self.health_checks.values() if h.status == "degraded"),
-            "hosts_unhealthy": sum(1 for h in self.health_checks.values() if h.status == "unhealthy"),
-            "hosts_unreachable": sum(1 for h in self.health_checks.values() if h.status == "unreachable"),
-            "active_alerts": len([a for a in self.alerts if not a.acknowledged]),
-            "critical_alerts": len([a for a in self.alerts if a.severity == "critical" and not a.acknowledged]),
+            "hosts_healthy": self._status_counts["healthy"],
+            "hosts_degraded": self._status_counts["degraded"],
+            "hosts_unhealthy": self._status_counts["unhealthy"],
+            "hosts_unreachable": self._status_counts["unreachable"],
+            "active_alerts": sum(self._severity_counts.values()),
+            "critical_alerts": self._severity_counts["critical"],
             "health_checks": {
                 host: {
                     "status": check.status,
                     "cpu": check.cpu_usage,
                     "memory": check.memory_usage,
                     "disk": check.disk_usage,
-                    "last_check": check.last_check.isoformat(),
+                    "last_check": check.last_check_iso,
                 }
                 for host, check in self.health_checks.items()
             },
@@ -352,15 +400,27 @@ class MonitoringAgent:
         """Acknowledge an alert."""
         for alert in self.alerts:
             if alert.id == alert_id:
-                alert.acknowledged = True
+                if not alert.acknowledged:
+                    alert.acknowledged = True
+                    self._severity_counts[alert.severity] -= 1
+                    key = (alert.host, alert.metric)
+                    if self._active_by_key.get(key) is alert:
+                        del self._active_by_key[key]
                 logger.info(f"Alert acknowledged: {alert_id}")
                 return True
         return False
 
     def clear_old_alerts(self, hours: int = 24):
         """Clear alerts older than specified hours."""
-        cutoff = datetime.now()
-        self.alerts = [
-            a for a in self.alerts
-            if (cutoff - a.created_at).seconds < hours * 3600
-        ]
+        now = time.monotonic()
+        max_age = hours * 3600
+        kept = []
+        for a in self.alerts:
+            if now - a.created_monotonic < max_age:
+                kept.append(a)
+            elif not a.acknowledged:
+                self._severity_counts[a.severity] -= 1
+                key = (a.host, a.metric)
+                if self._active_by_key.get(key) is a:
+                    del self._active_by_key[key]
+        self.alerts = kept
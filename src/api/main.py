@@ -1,21 +1,47 @@
 """FastAPI application for DevOps Agent."""
 
 import asyncio
+import contextlib
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from ..config import settings
-from ..agents import InfrastructureAgent, DocumentationAgent, MonitoringAgent
+
+if TYPE_CHECKING:
+    from ..agents import InfrastructureAgent, DocumentationAgent, MonitoringAgent
+
+class OrjsonJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, which handles datetimes natively."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        yield
+    finally:
+        await _stop_monitor()
+        if _infra_agent:
+            await _infra_agent.aclose()
+        if _doc_agent:
+            await _doc_agent.aclose()
+
 
 app = FastAPI(
     title="DevOps Agent API",
     description="AI-powered infrastructure discovery, monitoring, and documentation",
     version="1.0.0",
+    default_response_class=OrjsonJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -27,10 +53,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global agents
-infra_agent = InfrastructureAgent()
-doc_agent = DocumentationAgent()
-monitor_agent: Optional[MonitoringAgent] = None
+# Global agents, created on first use so that workers only serving
+# lightweight endpoints do not import the agents and their dependencies
+_infra_agent: Optional["InfrastructureAgent"] = None
+_doc_agent: Optional["DocumentationAgent"] = None
+monitor_agent: Optional["MonitoringAgent"] = None
+monitor_task: Optional[asyncio.Task] = None
+
+# Parsed discovery_result.json, keyed by the file's mtime
+_discovery_cache: Optional[tuple[int, dict]] = None
+
+
+def _load_discovery() -> Optional[dict]:
+    """Load the latest discovery results, reparsing only when the file changes."""
+    global _discovery_cache
+
+    output_file = settings.output_dir / "discovery_result.json"
+    try:
+        mtime = output_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _discovery_cache is None or _discovery_cache[0] != mtime:
+        _discovery_cache = (mtime, orjson.loads(output_file.read_bytes()))
+    return _discovery_cache[1]
+
+
+def get_infra_agent() -> "InfrastructureAgent":
+    """Get the shared infrastructure agent."""
+    global _infra_agent
+    if _infra_agent is None:
+        from ..agents import InfrastructureAgent
+        _infra_agent = InfrastructureAgent()
+    return _infra_agent
+
+
+def get_doc_agent() -> "DocumentationAgent":
+    """Get the shared documentation agent."""
+    global _doc_agent
+    if _doc_agent is None:
+        from ..agents import DocumentationAgent
+        _doc_agent = DocumentationAgent()
+    return _doc_agent
+
+
+async def _stop_monitor():
+    """Cancel the monitoring loop and release its connections."""
+    global monitor_task
+
+    if monitor_task:
+        monitor_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await monitor_task
+        monitor_task = None
+    if monitor_agent:
+        await monitor_agent.stop()
 
 
 # Request/Response models
@@ -59,7 +136,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(),
         "monitoring_active": monitor_agent is not None and monitor_agent._running,
     }
 
@@ -68,16 +145,22 @@ async def health_check():
 async def full_discovery(background_tasks: BackgroundTasks):
     """Start full infrastructure discovery."""
     async def run_discovery():
+        infra_agent = get_infra_agent()
         analysis = await infra_agent.full_discovery()
         result = infra_agent.to_dict(analysis)
 
         # Save to file
         settings.ensure_dirs()
         output_file = settings.output_dir / "discovery_result.json"
-        import json
-        output_file.write_text(json.dumps(result, indent=2))
+        output_file.write_bytes(
+            orjson.dumps(
+                result,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+        )
 
-    background_tasks.add_task(lambda: asyncio.run(run_discovery()))
+    background_tasks.add_task(run_discovery)
 
     return {
         "status": "started",
@@ -88,17 +171,16 @@ async def full_discovery(background_tasks: BackgroundTasks):
 @app.get("/discovery/status")
 async def discovery_status():
     """Get the latest discovery results."""
-    output_file = settings.output_dir / "discovery_result.json"
-    if output_file.exists():
-        import json
-        return json.loads(output_file.read_text())
+    data = _load_discovery()
+    if data is not None:
+        return data
     return {"status": "no_data", "message": "No discovery data available. Run /discover first."}
 
 
 @app.post("/scan")
 async def scan_host(request: ScanRequest):
     """Quick scan of a single host."""
-    result = await infra_agent.quick_scan(request.host)
+    result = await get_infra_agent().quick_scan(request.host)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -119,19 +201,17 @@ async def scan_network(request: NetworkScanRequest):
 
 
 @app.post("/monitor/start")
-async def start_monitoring(request: MonitorRequest, background_tasks: BackgroundTasks):
+async def start_monitoring(request: MonitorRequest):
     """Start monitoring specified hosts."""
-    global monitor_agent
+    global monitor_agent, monitor_task
 
     if monitor_agent and monitor_agent._running:
         return {"status": "already_running", "hosts": monitor_agent.hosts}
 
+    from ..agents import MonitoringAgent
     monitor_agent = MonitoringAgent(hosts=request.hosts, interval=request.interval)
-
-    async def run_monitoring():
-        await monitor_agent.start()
-
-    background_tasks.add_task(lambda: asyncio.run(run_monitoring()))
+    # Run on the server's event loop so stop() and shared clients work
+    monitor_task = asyncio.create_task(monitor_agent.start())
 
     return {
         "status": "started",
@@ -148,7 +228,7 @@ async def stop_monitoring():
     if not monitor_agent or not monitor_agent._running:
         return {"status": "not_running"}
 
-    await monitor_agent.stop()
+    await _stop_monitor()
     return {"status": "stopped"}
 
 
@@ -178,7 +258,7 @@ async def get_alerts():
                 "severity": a.severity,
                 "host": a.host,
                 "message": a.message,
-                "created_at": a.created_at.isoformat(),
+                "created_at": a.created_at_iso,
                 "acknowledged": a.acknowledged,
             }
             for a in monitor_agent.alerts
@@ -204,7 +284,7 @@ async def acknowledge_alert(alert_id: str):
 async def generate_documentation(request: DocumentRequest):
     """Generate documentation from discovery data."""
     if request.format == "markdown":
-        doc = await doc_agent.generate_full_documentation(request.data)
+        doc = await get_doc_agent().generate_full_documentation(request.data)
         return {"format": "markdown", "content": doc}
     else:
         return {"format": "json", "content": request.data}
@@ -213,15 +293,13 @@ async def generate_documentation(request: DocumentRequest):
 @app.get("/document/daily")
 async def daily_report():
     """Generate a daily infrastructure report."""
-    output_file = settings.output_dir / "discovery_result.json"
-    if not output_file.exists():
+    data = _load_discovery()
+    if data is None:
         raise HTTPException(status_code=404, detail="No discovery data. Run /discover first.")
 
-    import json
-    data = json.loads(output_file.read_text())
-    report = await doc_agent.generate_daily_report(data)
+    report = await get_doc_agent().generate_daily_report(data)
 
-    return {"report": report, "generated_at": datetime.now().isoformat()}
+    return {"report": report, "generated_at": datetime.now()}
 
 
 @app.get("/networks")
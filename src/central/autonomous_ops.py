@@ -6,14 +6,17 @@ Adds predictive intelligence, root-cause analysis,
 and autonomous decision-making on top of existing monitoring stack.
 """
 
-import time
-import statistics
-import requests
-from typing import Dict, List, Any
+import asyncio
+import math
+from collections import deque
+import httpx
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL = "devstral"
+# Anomalies arriving within this many seconds share one LLM call
+BATCH_WINDOW = 2.0
 
 # =========================
 # Core Event Schema
@@ -33,29 +36,71 @@ class InfraEvent:
 # =========================
 # Anomaly & Prediction
 # =========================
+class RollingWindow:
+    """Fixed-size window of samples with O(1) mean/stdev updates.
+
+    Uses Welford's algorithm, extended to replace the oldest sample once
+    the window is full, so statistics never need a pass over the window.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque(maxlen=size)
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float):
+        if len(self.values) < self.size:
+            self.values.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self._m2 += delta * (value - self.mean)
+        else:
+            # The deque evicts the oldest sample on append
+            old = self.values[0]
+            self.values.append(value)
+            new_mean = self.mean + (value - old) / self.size
+            self._m2 += (value - old) * (value - new_mean + old - self.mean)
+            self.mean = new_mean
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (same as statistics.stdev)."""
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (n - 1))
+
+
 class AnomalyDetector:
     def __init__(self, window_size: int = 10):
         self.window_size = window_size
-        self.history: Dict[str, List[float]] = {}
+        self.history: Dict[str, RollingWindow] = {}
 
     def add(self, key: str, value: float):
-        self.history.setdefault(key, []).append(value)
-        if len(self.history[key]) > self.window_size:
-            self.history[key].pop(0)
+        window = self.history.get(key)
+        if window is None:
+            window = self.history[key] = RollingWindow(self.window_size)
+        window.add(value)
 
     def is_anomaly(self, key: str, value: float) -> bool:
-        if key not in self.history or len(self.history[key]) < 5:
+        window = self.history.get(key)
+        if window is None or len(window) < 5:
             return False
-        mean = statistics.mean(self.history[key])
-        stdev = statistics.stdev(self.history[key])
-        return abs(value - mean) > (2 * stdev)
+        return abs(value - window.mean) > (2 * window.stdev)
 
 
 # =========================
 # LLM Reasoning Engine
 # =========================
 class LLMReasoner:
-    def analyze(self, events: List[InfraEvent]) -> str:
+    def __init__(self, http: Optional[httpx.AsyncClient] = None):
+        self._http = http or httpx.AsyncClient(timeout=20)
+
+    async def analyze(self, events: List[InfraEvent]) -> str:
         prompt = f"""
 You are an AIOps engine.
 Analyze the following infrastructure events.
@@ -67,7 +112,7 @@ Events:
 Return concise operational insight.
 """
         try:
-            res = requests.post(
+            res = await self._http.post(
                 OLLAMA_URL,
                 json={
                     "model": MODEL,
@@ -86,14 +131,13 @@ Return concise operational insight.
 # =========================
 class DecisionEngine:
     def decide(self, events: List[InfraEvent], analysis: str) -> Dict[str, Any]:
-        severity_levels = [e.severity for e in events]
-
-        if "critical" in severity_levels:
-            action = "ESCALATE_IMMEDIATELY"
-        elif "high" in severity_levels:
-            action = "PRIORITIZE_INVESTIGATION"
-        else:
-            action = "MONITOR"
+        action = "MONITOR"
+        for e in events:
+            if e.severity == "critical":
+                action = "ESCALATE_IMMEDIATELY"
+                break
+            if e.severity == "high":
+                action = "PRIORITIZE_INVESTIGATION"
 
         return {
             "action": action,
@@ -107,12 +151,16 @@ class DecisionEngine:
 # Autonomous Orchestrator
 # =========================
 class AutonomousOps:
-    def __init__(self):
+    def __init__(self, batch_window: float = BATCH_WINDOW):
         self.detector = AnomalyDetector()
-        self.llm = LLMReasoner()
+        self._http = httpx.AsyncClient(timeout=20)
+        self.llm = LLMReasoner(self._http)
         self.decision_engine = DecisionEngine()
+        self.batch_window = batch_window
+        self._pending: List[Tuple[List[InfraEvent], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
 
-    def ingest_metrics(self, node: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+    async def ingest_metrics(self, node: str, metrics: Dict[str, float]) -> Dict[str, Any]:
         events = []
 
         for metric, value in metrics.items():
@@ -126,7 +174,7 @@ class AutonomousOps:
         if not events:
             return {"status": "ok", "message": "No anomaly detected"}
 
-        analysis = self.llm.analyze(events)
+        analysis = await self._analyze(events)
         decision = self.decision_engine.decide(events, analysis)
 
         return {
@@ -135,22 +183,52 @@ class AutonomousOps:
             "decision": decision
         }
 
+    async def _analyze(self, events: List[InfraEvent]) -> str:
+        """Analyze events, coalescing concurrent callers into one LLM call."""
+        if self.batch_window <= 0:
+            return await self.llm.analyze(events)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((events, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.batch_window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        all_events = [e for events, _ in batch for e in events]
+        analysis = await self.llm.analyze(all_events)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(analysis)
+
+    async def aclose(self):
+        await self._http.aclose()
+
 
 # =========================
 # Standalone Test
 # =========================
 if __name__ == "__main__":
-    ops = AutonomousOps()
-
-    # simulate metrics
-    for i in range(12):
-        result = ops.ingest_metrics(
-            node="server041",
-            metrics={
-                "cpu": 60 + i * 3,
-                "memory": 70 + i * 2,
-                "gpu_temp": 65 + i * 2
-            }
-        )
-        print(result)
-        time.sleep(1)
+    async def main():
+        ops = AutonomousOps()
+
+        # simulate metrics
+        for i in range(12):
+            result = await ops.ingest_metrics(
+                node="server041",
+                metrics={
+                    "cpu": 60 + i * 3,
+                    "memory": 70 + i * 2,
+                    "gpu_temp": 65 + i * 2
+                }
+            )
+            print(result)
+            await asyncio.sleep(1)
+
+        await ops.aclose()
+
+    asyncio.run(main())
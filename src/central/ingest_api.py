@@ -6,17 +6,35 @@ in VictoriaMetrics and OpenObserve.
 """
 
 import asyncio
+import io
 import json
 import logging
 import os
+import struct
 import time
-from typing import Optional
+import zlib
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Awaitable, Callable, Optional
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, StreamingResponse
 import aiohttp
+import msgspec
+
+try:
+    import zstandard
+except ImportError:  # zstd-encoded request bodies are rejected with 415
+    zstandard = None
+
+try:
+    import snappy
+except ImportError:  # metrics fall back to the Prometheus text import endpoint
+    snappy = None
 
 logger = logging.getLogger(__name__)
 
@@ -29,16 +47,144 @@ OPENOBSERVE_PASSWORD = os.getenv("OPENOBSERVE_PASSWORD", "SidraMonitor2024!")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "devstral")
 
-
-# Request/Response models
-class MetricPoint(BaseModel):
+# Outbound HTTP pool shared by the VictoriaMetrics and OpenObserve clients
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "512"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "256"))
+
+# Coalescing of edge agent writes before they reach the storage backends
+INGEST_FLUSH_INTERVAL_MS = int(os.getenv("INGEST_FLUSH_INTERVAL_MS", "50"))
+INGEST_MAX_BATCH = int(os.getenv("INGEST_MAX_BATCH", "5000"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+# Upper bound on a decompressed request body
+INGEST_MAX_BODY_BYTES = int(os.getenv("INGEST_MAX_BODY_BYTES", str(64 * 1024 * 1024)))
+# Ingest requests handled at once; others wait up to INGEST_SLOT_TIMEOUT
+# seconds for a slot and are then answered 503 so the agent retries later
+MAX_INFLIGHT = int(os.getenv("MAX_INFLIGHT", "256"))
+INGEST_SLOT_TIMEOUT = float(os.getenv("INGEST_SLOT_TIMEOUT", "0.5"))
+
+
+# PromQL queries behind /api/v1/summary
+SUMMARY_QUERIES = {
+    "hosts_up": 'count(sidra_agent_health == 1)',
+    "avg_cpu": 'avg(sidra_cpu_usage_percent)',
+    "avg_memory": 'avg(sidra_memory_usage_percent)',
+    "critical_alerts": 'count(alerts{severity="critical"})',
+}
+
+
+# Escapes for Prometheus exposition label values
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+
+def _with_defaults(labels: tuple, defaults: tuple) -> tuple:
+    """Append the default label pairs whose names are not already in labels."""
+    if not defaults:
+        return labels
+    names = {k for k, _ in labels}
+    return labels + tuple([(k, v) for k, v in defaults if k not in names])
+
+
+@lru_cache(maxsize=16384)
+def _series_prefix(name: str, labels: tuple, defaults: tuple = ()) -> str:
+    """Format 'name{k="v",...}' for a series.
+
+    Agents resend the same series on every scrape, so the formatted
+    prefix is cached instead of rebuilt for each sample.
+    """
+    labels = _with_defaults(labels, defaults)
+    if not labels:
+        return name
+    labels_str = ",".join([
+        f'{k}="{str(v).translate(_LABEL_ESCAPES)}"' for k, v in labels
+    ])
+    return f"{name}{{{labels_str}}}"
+
+
+# Prometheus remote-write encoding.
+#
+# WriteRequest{timeseries=1}, TimeSeries{labels=1, samples=2},
+# Label{name=1, value=2}, Sample{value=1 (double), timestamp=2 (int64)}.
+# The messages are tiny, so they are encoded by hand instead of pulling in
+# protobuf. Concatenated WriteRequest encodings are themselves a valid
+# WriteRequest, which lets the write coalescer merge them with b"".join.
+def _pb_varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _pb_field(tag: int, payload: bytes) -> bytes:
+    """Encode a length-delimited field."""
+    return bytes((tag,)) + _pb_varint(len(payload)) + payload
+
+
+@lru_cache(maxsize=16384)
+def _series_labels_pb(name: str, labels: tuple, defaults: tuple = ()) -> bytes:
+    """Encoded Label fields of a TimeSeries, sorted by label name."""
+    labels = _with_defaults(labels, defaults)
+    pairs = sorted([("__name__", name)] + [(str(k), str(v)) for k, v in labels])
+    return b"".join([
+        _pb_field(0x0A, _pb_field(0x0A, k.encode()) + _pb_field(0x12, v.encode()))
+        for k, v in pairs
+    ])
+
+
+_pack_double = struct.Struct("<d").pack
+
+
+def _encode_write_request(metrics: list["MetricPoint"], defaults: tuple = ()) -> bytes:
+    """Encode metrics as an uncompressed remote-write WriteRequest."""
+    pack_double = _pack_double
+    # Agents stamp a whole scrape with one timestamp, so the bytes around
+    # each sample value are built once per timestamp: the Sample field
+    # header and value tag, and the encoded timestamp field
+    framing: dict[float, tuple[bytes, bytes]] = {}
+    # Group samples by series so each label set is written once
+    series: dict[tuple, list[bytes]] = {}
+    for m in metrics:
+        frame = framing.get(m.timestamp)
+        if frame is None:
+            ts = _pb_varint(int(m.timestamp * 1000) & 0xFFFFFFFFFFFFFFFF)
+            # A Sample is at most 1 + 8 + 1 + 10 bytes, so its length
+            # always fits in a single varint byte
+            frame = framing[m.timestamp] = (bytes((0x12, 10 + len(ts), 0x09)), b"\x10" + ts)
+        head, tail = frame
+        sample = head + pack_double(m.value) + tail
+
+        key = (m.name, tuple(m.labels.items()))
+        try:
+            samples = series.get(key)
+        except TypeError:  # unhashable label value, group by its text form
+            key = (m.name, tuple([(k, str(v)) for k, v in m.labels.items()]))
+            samples = series.get(key)
+        if samples is None:
+            series[key] = [sample]
+        else:
+            samples.append(sample)
+
+    parts = []
+    for (name, labels), samples in series.items():
+        body = _series_labels_pb(name, labels, defaults) + b"".join(samples)
+        parts.append(_pb_field(0x0A, body))
+    return b"".join(parts)
+
+
+# Request models
+#
+# Ingest payloads are decoded with msgspec rather than pydantic: these
+# endpoints are hit by every edge agent on every flush, and msgspec decodes
+# JSON straight into these structs in a single C pass.
+class MetricPoint(msgspec.Struct, kw_only=True):
     name: str
     value: float
     timestamp: float
-    labels: dict = Field(default_factory=dict)
+    labels: dict = msgspec.field(default_factory=dict)
 
 
-class Alert(BaseModel):
+class Alert(msgspec.Struct, kw_only=True):
     metric: str
     value: str | float | int
     threshold: str | float | int | None = None
@@ -46,80 +192,246 @@ class Alert(BaseModel):
     message: str
     timestamp: float
     host: str = ""
-    labels: dict = Field(default_factory=dict)
+    labels: dict = msgspec.field(default_factory=dict)
 
 
-class LogEntry(BaseModel):
+class LogEntry(msgspec.Struct, kw_only=True):
     level: str
     message: str
     source: str = ""
-    timestamp: float = Field(default_factory=time.time)
+    timestamp: float = msgspec.field(default_factory=time.time)
 
 
-class MetricsPayload(BaseModel):
+class MetricsPayload(msgspec.Struct, kw_only=True):
     timestamp: float
     host: str = ""
     priority: str = "NORMAL"
-    metrics: list[MetricPoint] = Field(default_factory=list)
+    metrics: list[MetricPoint] = msgspec.field(default_factory=list)
 
 
-class AlertsPayload(BaseModel):
+class AlertsPayload(msgspec.Struct, kw_only=True):
     timestamp: float
     host: str = ""
     alert: Alert | None = None
-    alerts: list[Alert] = Field(default_factory=list)
+    alerts: list[Alert] = msgspec.field(default_factory=list)
 
 
-class LogsPayload(BaseModel):
+class LogsPayload(msgspec.Struct, kw_only=True):
     timestamp: float
     host: str = ""
-    logs: list[LogEntry] = Field(default_factory=list)
+    logs: list[LogEntry] = msgspec.field(default_factory=list)
 
 
-class BatchPayload(BaseModel):
+class BatchPayload(msgspec.Struct, kw_only=True):
     timestamp: float
     host: str = ""
     priority: str = "NORMAL"
-    metrics: list[MetricPoint] = Field(default_factory=list)
-    alerts: list[Alert] = Field(default_factory=list)
-    logs: list[dict] = Field(default_factory=list)
+    metrics: list[MetricPoint] = msgspec.field(default_factory=list)
+    alerts: list[Alert] = msgspec.field(default_factory=list)
+    logs: list[dict] = msgspec.field(default_factory=list)
+
+
+# OpenObserve records, encoded straight to JSON without intermediate dicts
+class LogRecord(msgspec.Struct):
+    timestamp: int = msgspec.field(name="_timestamp")  # microseconds
+    level: str
+    message: str
+    source: str
+    host: str
+
+
+class AlertLogRecord(msgspec.Struct):
+    timestamp: int = msgspec.field(name="_timestamp")  # microseconds
+    metric: str
+    value: str
+    threshold: str
+    severity: str
+    message: str
+    host: str
+
+
+class AlertRecord(msgspec.Struct, gc=False):
+    """Compact copy of an Alert kept by AlertStore.
+
+    Holds only the scalar fields served by the alert endpoints. With no
+    containers it can skip GC tracking, so a full store is never traversed
+    by the cyclic garbage collector.
+    """
+    severity: str
+    host: str
+    message: str
+    timestamp: float
+    metric: str
+    value: str | float | int
+    threshold: str | float | int | None = None
+
+
+# strict=False keeps pydantic's lax coercion (e.g. "1.5" -> 1.5)
+_metrics_decoder = msgspec.json.Decoder(MetricsPayload, strict=False)
+_alerts_decoder = msgspec.json.Decoder(AlertsPayload, strict=False)
+_logs_decoder = msgspec.json.Decoder(LogsPayload, strict=False)
+_batch_decoder = msgspec.json.Decoder(BatchPayload, strict=False)
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response encoded with msgspec, which also handles the structs above."""
+
+    def render(self, content) -> bytes:
+        return msgspec.json.encode(content)
+
+
+async def _read_body(request: Request) -> bytes:
+    """Read a request body, decompressing gzip, deflate or zstd as it streams in."""
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding in ("", "identity"):
+        return await request.body()
+
+    if encoding == "zstd" and zstandard is not None:
+        return await _read_zstd_body(request)
+    if encoding in ("gzip", "x-gzip"):
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decompressor = zlib.decompressobj()
+    else:
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+
+    # Inflate at most one byte past the remaining budget per call, so an
+    # oversized body is rejected before it is held in memory
+    chunks = []
+    size = 0
+    try:
+        async for data in request.stream():
+            while data:
+                piece = decompressor.decompress(data, INGEST_MAX_BODY_BYTES - size + 1)
+                size += len(piece)
+                if size > INGEST_MAX_BODY_BYTES:
+                    raise HTTPException(status_code=413, detail="Decompressed body too large")
+                chunks.append(piece)
+                data = decompressor.unconsumed_tail
+        piece = decompressor.flush(INGEST_MAX_BODY_BYTES - size + 1)
+        if size + len(piece) > INGEST_MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="Decompressed body too large")
+        chunks.append(piece)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {encoding} body: {e}")
+    return b"".join(chunks)
+
+
+async def _read_zstd_body(request: Request) -> bytes:
+    """Read a zstd request body, decompressing at most INGEST_MAX_BODY_BYTES."""
+    # zstd decompressobj has no output bound, so buffer the compressed body
+    # (never larger than the limit for any useful payload) and read it back
+    # through a bounded stream reader
+    compressed = bytearray()
+    async for chunk in request.stream():
+        compressed += chunk
+        if len(compressed) > INGEST_MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="Request body too large")
+
+    chunks = []
+    size = 0
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(
+            io.BytesIO(compressed), read_across_frames=True
+        ) as reader:
+            while True:
+                piece = reader.read(INGEST_MAX_BODY_BYTES - size + 1)
+                if not piece:
+                    break
+                size += len(piece)
+                if size > INGEST_MAX_BODY_BYTES:
+                    raise HTTPException(status_code=413, detail="Decompressed body too large")
+                chunks.append(piece)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid zstd body: {e}")
+    return b"".join(chunks)
+
+
+async def _decode_body(request: Request, decoder: msgspec.json.Decoder):
+    """Decode a request body, answering 422 for invalid payloads."""
+    body = await _read_body(request)
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 # Storage clients
 class VictoriaMetricsClient:
     """Client for VictoriaMetrics."""
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, session: aiohttp.ClientSession):
         self.url = url.rstrip('/')
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session = session
+        # Prefer the native remote-write endpoint: compact snappy-compressed
+        # protobuf instead of text that VictoriaMetrics has to parse
+        self.remote_write = snappy is not None
+        # Built once here rather than on every write
+        if self.remote_write:
+            self._write_url = f"{self.url}/api/v1/write"
+            self._write_headers = {
+                "Content-Type": "application/x-protobuf",
+                "Content-Encoding": "snappy",
+                "X-Prometheus-Remote-Write-Version": "0.1.0",
+            }
+        else:
+            self._write_url = f"{self.url}/api/v1/import/prometheus"
+            self._write_headers = {"Content-Type": "text/plain; charset=utf-8"}
+        self._query_url = f"{self.url}/api/v1/query"
+
+    def serialize(
+        self, metrics: list[MetricPoint], default_labels: Optional[dict] = None
+    ) -> bytes:
+        """Serialize metrics for write_serialized.
+
+        ``default_labels`` are added to every metric that does not already
+        carry a label of the same name; the metrics themselves are not
+        modified. Serialized chunks can be concatenated with b"".join into
+        one write.
+        """
+        defaults = tuple(default_labels.items()) if default_labels else ()
+        if self.remote_write:
+            return _encode_write_request(metrics, defaults)
+        return self._serialize_text(metrics, defaults)
+
+    @staticmethod
+    def _serialize_text(metrics: list[MetricPoint], defaults: tuple = ()) -> bytes:
+        """Convert metrics to Prometheus exposition format, one row per metric."""
+        lines = []
+        append = lines.append
+        for m in metrics:
+            if m.labels or defaults:
+                labels = tuple(m.labels.items())
+                try:
+                    prefix = _series_prefix(m.name, labels, defaults)
+                except TypeError:  # unhashable label value
+                    prefix = _series_prefix.__wrapped__(m.name, labels, defaults)
+            else:
+                prefix = m.name
+            append(f"{prefix} {m.value} {int(m.timestamp * 1000)}\n")
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        return "".join(lines).encode("utf-8")
 
-    async def write(self, metrics: list[MetricPoint]) -> bool:
-        """Write metrics in Prometheus format."""
+    async def write(
+        self, metrics: list[MetricPoint], default_labels: Optional[dict] = None
+    ) -> bool:
+        """Write metrics to VictoriaMetrics."""
         if not metrics:
             return True
+        return await self.write_serialized(self.serialize(metrics, default_labels))
 
-        # Convert to Prometheus format
-        lines = []
-        for m in metrics:
-            labels_str = ",".join(f'{k}="{v}"' for k, v in m.labels.items())
-            if labels_str:
-                lines.append(f"{m.name}{{{labels_str}}} {m.value} {int(m.timestamp * 1000)}")
-            else:
-                lines.append(f"{m.name} {m.value} {int(m.timestamp * 1000)}")
-
-        data = "\n".join(lines)
+    async def write_serialized(self, data: bytes) -> bool:
+        """Write metrics produced by serialize."""
+        if self.remote_write:
+            data = snappy.compress(data)
 
         try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.url}/api/v1/import/prometheus",
-                data=data,
-                headers={"Content-Type": "text/plain"},
+            async with self._session.post(
+                self._write_url, data=data, headers=self._write_headers
             ) as response:
                 return response.status in (200, 204)
         except Exception as e:
@@ -129,9 +441,8 @@ class VictoriaMetricsClient:
     async def query(self, query: str) -> dict:
         """Execute a PromQL query."""
         try:
-            session = await self._get_session()
-            async with session.get(
-                f"{self.url}/api/v1/query",
+            async with self._session.get(
+                self._query_url,
                 params={"query": query},
             ) as response:
                 return await response.json()
@@ -139,75 +450,167 @@ class VictoriaMetricsClient:
             logger.error(f"VictoriaMetrics query error: {e}")
             return {}
 
-    async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
-
 
 class OpenObserveClient:
     """Client for OpenObserve."""
 
-    def __init__(self, url: str, user: str, password: str):
+    def __init__(self, url: str, user: str, password: str, session: aiohttp.ClientSession):
         self.url = url.rstrip('/')
         self.user = user
         self.password = password
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            auth = aiohttp.BasicAuth(self.user, self.password)
-            self._session = aiohttp.ClientSession(auth=auth)
-        return self._session
-
-    async def write_logs(self, logs: list[dict], stream: str = "logs") -> bool:
-        """Write logs to OpenObserve."""
-        if not logs:
+        self._session = session
+        # Auth is sent per request so the session can be shared
+        self._auth = aiohttp.BasicAuth(user, password)
+        self._stream_urls: dict[str, str] = {}
+        self._json_headers = {"Content-Type": "application/json"}
+
+    @staticmethod
+    def format_logs(logs: list[LogEntry], host: str) -> list[LogRecord]:
+        """Format log entries as OpenObserve records."""
+        return [
+            LogRecord(int(log.timestamp * 1000000), log.level, log.message, log.source, host)
+            for log in logs
+        ]
+
+    @staticmethod
+    def format_log_dicts(logs: list[dict], host: str) -> list[LogRecord]:
+        """Format untyped log entries (as sent in batches) as OpenObserve records."""
+        now = time.time()
+        return [
+            LogRecord(
+                int(log.get('timestamp', now) * 1000000),
+                log.get('level', 'info'),
+                log.get('message', ''),
+                log.get('source', ''),
+                host,
+            )
+            for log in logs
+        ]
+
+    @staticmethod
+    def format_alerts(alerts: list[Alert]) -> list[AlertLogRecord]:
+        """Format alerts as OpenObserve records."""
+        return [
+            AlertLogRecord(
+                int(alert.timestamp * 1000000),
+                alert.metric,
+                str(alert.value),
+                "" if alert.threshold is None else str(alert.threshold),
+                alert.severity,
+                alert.message,
+                alert.host,
+            )
+            for alert in alerts
+        ]
+
+    async def write_records(self, records: list, stream: str) -> bool:
+        """Write already formatted records to an OpenObserve stream."""
+        if not records:
             return True
 
-        # Format logs for OpenObserve
-        formatted = []
-        for log in logs:
-            formatted.append({
-                "_timestamp": int(log.get('timestamp', time.time()) * 1000000),  # microseconds
-                "level": log.get('level', 'info'),
-                "message": log.get('message', ''),
-                "source": log.get('source', ''),
-                "host": log.get('host', ''),
-            })
+        url = self._stream_urls.get(stream)
+        if url is None:
+            url = self._stream_urls[stream] = f"{self.url}/api/default/{stream}/_json"
 
         try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.url}/api/default/{stream}/_json",
-                json=formatted,
+            async with self._session.post(
+                url,
+                data=msgspec.json.encode(records),
+                headers=self._json_headers,
+                auth=self._auth,
             ) as response:
                 return response.status in (200, 204)
         except Exception as e:
             logger.error(f"OpenObserve write error: {e}")
             return False
 
+    async def write_logs(self, logs: list[LogEntry], host: str, stream: str = "logs") -> bool:
+        """Write logs to OpenObserve."""
+        return await self.write_records(self.format_logs(logs, host), stream)
+
     async def write_alerts(self, alerts: list[Alert]) -> bool:
         """Write alerts to OpenObserve alerts stream."""
-        if not alerts:
+        return await self.write_records(self.format_alerts(alerts), "alerts")
+
+
+class WriteCoalescer:
+    """Merge concurrent writes to one backend into fewer, larger requests.
+
+    Callers submit items and wait for the write that carries them, so they
+    still learn whether their data was stored. Items submitted within
+    ``flush_interval`` seconds of each other (up to ``max_batch`` items) are
+    sent together. The queue is bounded, so callers wait when it is full.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list], Awaitable[bool]],
+        flush_interval: float,
+        max_batch: int,
+        max_queue: int,
+    ):
+        self._send = send
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[tuple[list, asyncio.Future]] = asyncio.Queue(max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+
+    async def submit(self, items: list) -> bool:
+        """Queue items for the next write and wait for its result."""
+        if not items:
             return True
-
-        formatted = []
-        for alert in alerts:
-            formatted.append({
-                "_timestamp": int(alert.timestamp * 1000000),
-                "metric": alert.metric,
-                "value": str(alert.value),
-                "threshold": str(alert.threshold) if alert.threshold else "",
-                "severity": alert.severity,
-                "message": alert.message,
-                "host": alert.host,
-            })
-
-        return await self.write_logs(formatted, stream="alerts")
-
-    async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items, future = await self._queue.get()
+            batch = list(items)
+            futures = [future]
+
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items, future = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.extend(items)
+                futures.append(future)
+
+            # Send in the background so the next batch can start filling
+            task = asyncio.create_task(self._flush(batch, futures))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list, futures: list[asyncio.Future]):
+        try:
+            success = await self._send(batch)
+        except Exception as e:
+            logger.error(f"Coalesced write error: {e}")
+            success = False
+        for future in futures:
+            if not future.done():
+                future.set_result(success)
 
 
 # Alert store for LLM analysis
@@ -216,32 +619,116 @@ class AlertStore:
 
     def __init__(self, max_size: int = 1000):
         self.max_size = max_size
-        self._alerts: list[Alert] = []
-        self._lock = asyncio.Lock()
-
-    async def add(self, alert: Alert):
-        async with self._lock:
-            self._alerts.append(alert)
-            if len(self._alerts) > self.max_size:
-                self._alerts = self._alerts[-self.max_size:]
-
-    async def get_recent(self, count: int = 100) -> list[Alert]:
-        async with self._lock:
-            return self._alerts[-count:]
-
-    async def get_by_severity(self, severity: str, count: int = 50) -> list[Alert]:
-        async with self._lock:
-            return [a for a in self._alerts if a.severity == severity][-count:]
+        # Oldest alerts are evicted automatically once max_size is reached
+        self._alerts: deque[AlertRecord] = deque(maxlen=max_size)
+        # Per-severity index of (sequence number, alert); entries whose
+        # sequence number has been evicted from _alerts are skipped on read
+        self._by_severity: dict[str, deque[tuple[int, AlertRecord]]] = {}
+        self._added = 0
+
+    def add(self, alert: Alert):
+        record = AlertRecord(
+            alert.severity,
+            alert.host,
+            alert.message,
+            alert.timestamp,
+            alert.metric,
+            alert.value,
+            alert.threshold,
+        )
+        self._added += 1
+        self._alerts.append(record)
+        index = self._by_severity.get(alert.severity)
+        if index is None:
+            index = self._by_severity[alert.severity] = deque(maxlen=self.max_size)
+        index.append((self._added, record))
+
+    def get_recent(self, count: int = 100) -> list[AlertRecord]:
+        start = max(0, len(self._alerts) - count)
+        return list(islice(self._alerts, start, None))
+
+    def get_by_severity(self, severity: str, count: int = 50) -> list[AlertRecord]:
+        oldest_evicted = self._added - len(self._alerts)
+        alerts = []
+        for seq, alert in reversed(self._by_severity.get(severity, ())):
+            if seq <= oldest_evicted or len(alerts) >= count:
+                break
+            alerts.append(alert)
+        alerts.reverse()
+        return alerts
+
+
+ALERT_STREAM_CHUNK = 200
+
+
+async def _stream_alerts(alerts: list[AlertRecord]):
+    """Yield {"count": ..., "alerts": [...]} as JSON, a slice of alerts at a time."""
+    yield b'{"count":%d,"alerts":[' % len(alerts)
+    encode = msgspec.json.encode
+    for start in range(0, len(alerts), ALERT_STREAM_CHUNK):
+        # Encode the slice as a list and strip its brackets
+        chunk = encode(alerts[start:start + ALERT_STREAM_CHUNK])[1:-1]
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]}"
 
 
 # Create FastAPI app
 def create_app() -> FastAPI:
     """Create the FastAPI application."""
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # One pooled keep-alive session for all outbound writes and queries
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30, connect=2),
+        )
+        app.state.vm_client = VictoriaMetricsClient(VICTORIAMETRICS_URL, session)
+        app.state.oo_client = OpenObserveClient(
+            OPENOBSERVE_URL, OPENOBSERVE_USER, OPENOBSERVE_PASSWORD, session
+        )
+
+        vm_client, oo_client = app.state.vm_client, app.state.oo_client
+        coalescer_kwargs = {
+            "flush_interval": INGEST_FLUSH_INTERVAL_MS / 1000,
+            "max_batch": INGEST_MAX_BATCH,
+            "max_queue": INGEST_QUEUE_SIZE,
+        }
+        app.state.metrics_writer = WriteCoalescer(
+            lambda chunks: vm_client.write_serialized(b"".join(chunks)),
+            **coalescer_kwargs,
+        )
+        app.state.alerts_writer = WriteCoalescer(
+            lambda records: oo_client.write_records(records, "alerts"),
+            **coalescer_kwargs,
+        )
+        app.state.logs_writer = WriteCoalescer(
+            lambda records: oo_client.write_records(records, "logs"),
+            **coalescer_kwargs,
+        )
+        writers = (app.state.metrics_writer, app.state.alerts_writer, app.state.logs_writer)
+        for writer in writers:
+            writer.start()
+
+        try:
+            yield
+        finally:
+            for writer in writers:
+                await writer.stop()
+            await session.close()
+
     app = FastAPI(
         title="Sidra Central Brain - Ingest API",
         description="Receives metrics, logs, and alerts from Edge Agents",
         version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=MsgspecJSONResponse,
     )
 
     app.add_middleware(
@@ -252,15 +739,24 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Initialize clients
-    vm_client = VictoriaMetricsClient(VICTORIAMETRICS_URL)
-    oo_client = OpenObserveClient(OPENOBSERVE_URL, OPENOBSERVE_USER, OPENOBSERVE_PASSWORD)
     alert_store = AlertStore()
+    # Bounds how many ingest payloads are decoded and held in memory at once
+    ingest_slots = asyncio.Semaphore(MAX_INFLIGHT)
 
-    @app.on_event("shutdown")
-    async def shutdown():
-        await vm_client.close()
-        await oo_client.close()
+    async def ingest_slot():
+        """Hold an ingest slot for the request, or answer 503 when none frees up."""
+        try:
+            await asyncio.wait_for(ingest_slots.acquire(), timeout=INGEST_SLOT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=503,
+                detail="Ingest API is overloaded",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            yield
+        finally:
+            ingest_slots.release()
 
     @app.get("/health")
     async def health_check():
@@ -274,19 +770,18 @@ def create_app() -> FastAPI:
             }
         }
 
-    @app.post("/api/v1/ingest/metrics")
-    async def ingest_metrics(payload: MetricsPayload, background_tasks: BackgroundTasks):
+    @app.post("/api/v1/ingest/metrics", dependencies=[Depends(ingest_slot)])
+    async def ingest_metrics(request: Request):
         """Ingest metrics from edge agents."""
+        payload = await _decode_body(request, _metrics_decoder)
         if not payload.metrics:
             return {"status": "ok", "message": "No metrics to ingest"}
 
-        # Add host label to all metrics
-        for metric in payload.metrics:
-            if payload.host and 'host' not in metric.labels:
-                metric.labels['host'] = payload.host
-
-        # Write to VictoriaMetrics
-        success = await vm_client.write(payload.metrics)
+        # Write to VictoriaMetrics, labelling metrics with the sending host
+        host_labels = {"host": payload.host} if payload.host else None
+        success = await app.state.metrics_writer.submit(
+            [app.state.vm_client.serialize(payload.metrics, host_labels)]
+        )
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to write metrics")
@@ -296,9 +791,10 @@ def create_app() -> FastAPI:
             "metrics_received": len(payload.metrics),
         }
 
-    @app.post("/api/v1/ingest/alerts")
-    async def ingest_alerts(payload: AlertsPayload, background_tasks: BackgroundTasks):
+    @app.post("/api/v1/ingest/alerts", dependencies=[Depends(ingest_slot)])
+    async def ingest_alerts(request: Request):
         """Ingest alerts from edge agents."""
+        payload = await _decode_body(request, _alerts_decoder)
         alerts = payload.alerts
         if payload.alert:
             alerts.append(payload.alert)
@@ -310,10 +806,12 @@ def create_app() -> FastAPI:
         for alert in alerts:
             if not alert.host and payload.host:
                 alert.host = payload.host
-            await alert_store.add(alert)
+            alert_store.add(alert)
 
         # Write to OpenObserve
-        success = await oo_client.write_alerts(alerts)
+        success = await app.state.alerts_writer.submit(
+            OpenObserveClient.format_alerts(alerts)
+        )
 
         # Log critical alerts
         for alert in alerts:
@@ -325,21 +823,17 @@ def create_app() -> FastAPI:
             "alerts_received": len(alerts),
         }
 
-    @app.post("/api/v1/ingest/logs")
-    async def ingest_logs(payload: LogsPayload):
+    @app.post("/api/v1/ingest/logs", dependencies=[Depends(ingest_slot)])
+    async def ingest_logs(request: Request):
         """Ingest logs from edge agents."""
+        payload = await _decode_body(request, _logs_decoder)
         if not payload.logs:
             return {"status": "ok", "message": "No logs to ingest"}
 
-        # Add host to logs
-        logs = []
-        for log in payload.logs:
-            log_dict = log.dict()
-            log_dict['host'] = payload.host
-            logs.append(log_dict)
-
         # Write to OpenObserve
-        success = await oo_client.write_logs(logs)
+        success = await app.state.logs_writer.submit(
+            OpenObserveClient.format_logs(payload.logs, payload.host)
+        )
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to write logs")
@@ -349,17 +843,20 @@ def create_app() -> FastAPI:
             "logs_received": len(payload.logs),
         }
 
-    @app.post("/api/v1/ingest/batch")
-    async def ingest_batch(payload: BatchPayload, background_tasks: BackgroundTasks):
+    @app.post("/api/v1/ingest/batch", dependencies=[Depends(ingest_slot)])
+    async def ingest_batch(request: Request):
         """Ingest a batch of metrics, alerts, and logs."""
+        payload = await _decode_body(request, _batch_decoder)
         results = {}
+        # The backends are independent, so their writes run concurrently
+        writes = []
 
         # Process metrics
         if payload.metrics:
-            for metric in payload.metrics:
-                if payload.host and 'host' not in metric.labels:
-                    metric.labels['host'] = payload.host
-            await vm_client.write(payload.metrics)
+            host_labels = {"host": payload.host} if payload.host else None
+            writes.append(app.state.metrics_writer.submit(
+                [app.state.vm_client.serialize(payload.metrics, host_labels)]
+            ))
             results['metrics'] = len(payload.metrics)
 
         # Process alerts
@@ -367,19 +864,21 @@ def create_app() -> FastAPI:
             for alert in payload.alerts:
                 if not alert.host:
                     alert.host = payload.host
-                await alert_store.add(alert)
-            await oo_client.write_alerts(payload.alerts)
+                alert_store.add(alert)
+            writes.append(app.state.alerts_writer.submit(
+                OpenObserveClient.format_alerts(payload.alerts)
+            ))
             results['alerts'] = len(payload.alerts)
 
         # Process logs
         if payload.logs:
-            logs = []
-            for log in payload.logs:
-                log['host'] = payload.host
-                logs.append(log)
-            await oo_client.write_logs(logs)
+            writes.append(app.state.logs_writer.submit(
+                OpenObserveClient.format_log_dicts(payload.logs, payload.host)
+            ))
             results['logs'] = len(payload.logs)
 
+        await asyncio.gather(*writes)
+
         return {
             "status": "ok",
             "received": results,
@@ -388,49 +887,48 @@ def create_app() -> FastAPI:
     @app.get("/api/v1/alerts/recent")
     async def get_recent_alerts(count: int = 100):
         """Get recent alerts."""
-        alerts = await alert_store.get_recent(count)
-        return {
-            "count": len(alerts),
-            "alerts": [a.dict() for a in alerts],
-        }
+        alerts = alert_store.get_recent(count)
+        # Encoded a slice at a time, so the full JSON document is never
+        # held in memory for large counts
+        return StreamingResponse(
+            _stream_alerts(alerts), media_type="application/json"
+        )
 
     @app.get("/api/v1/alerts/critical")
     async def get_critical_alerts(count: int = 50):
         """Get critical alerts."""
-        alerts = await alert_store.get_by_severity("critical", count)
-        return {
-            "count": len(alerts),
-            "alerts": [a.dict() for a in alerts],
-        }
+        alerts = alert_store.get_by_severity("critical", count)
+        # Returned as a response object so the structs are encoded directly
+        return MsgspecJSONResponse({"count": len(alerts), "alerts": alerts})
 
     @app.get("/api/v1/query")
     async def query_metrics(q: str):
         """Query metrics using PromQL."""
-        result = await vm_client.query(q)
-        return result
+        result = await app.state.vm_client.query(q)
+        return MsgspecJSONResponse(result)
 
     @app.get("/api/v1/summary")
     async def get_summary():
         """Get a summary of infrastructure status."""
-        # Query for current metrics
-        queries = {
-            "hosts_up": 'count(sidra_agent_health == 1)',
-            "avg_cpu": 'avg(sidra_cpu_usage_percent)',
-            "avg_memory": 'avg(sidra_memory_usage_percent)',
-            "critical_alerts": 'count(alerts{severity="critical"})',
-        }
+        # Query for current metrics; the queries are independent, so run
+        # them concurrently
+        responses = await asyncio.gather(
+            *[app.state.vm_client.query(query) for query in SUMMARY_QUERIES.values()],
+            return_exceptions=True,
+        )
 
         results = {}
-        for name, query in queries.items():
+        for name, result in zip(SUMMARY_QUERIES, responses):
             try:
-                result = await vm_client.query(query)
+                if isinstance(result, Exception):
+                    raise result
                 if result.get('data', {}).get('result'):
                     results[name] = result['data']['result'][0]['value'][1]
             except Exception:
                 results[name] = 'N/A'
 
         # Get recent alerts
-        recent_alerts = await alert_store.get_recent(10)
+        recent_alerts = alert_store.get_recent(10)
 
         return {
             "timestamp": time.time(),
@@ -449,4 +947,6 @@ app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8200)
+    # uvloop and httptools replace the default asyncio loop and h11 parser;
+    # the aiohttp clients run on the same loop
+    uvicorn.run(app, host="0.0.0.0", port=8200, loop="uvloop", http="httptools")
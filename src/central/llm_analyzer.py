@@ -6,19 +6,264 @@ and generate human-readable reports.
 """
 
 import asyncio
-import json
+import hashlib
+import io
 import logging
 import os
+import re
 import time
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import aclosing
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from itertools import repeat
+from typing import AsyncIterator, Optional
 import aiohttp
+import msgspec
 
 logger = logging.getLogger(__name__)
 
+# Log analysis is split into up to this many prompts, sent concurrently.
+# Ollama only runs them in parallel when OLLAMA_NUM_PARALLEL allows it.
+LOG_ANALYSIS_SHARDS = int(os.getenv("LOG_ANALYSIS_SHARDS", "4"))
+# Minimum number of logs per shard; smaller batches use a single prompt
+LOG_SHARD_MIN_SIZE = 50
+
+# Upper bound, in characters, on the log or alert summary embedded in a
+# prompt (about 1000 tokens). Prompt evaluation time grows with its length.
+PROMPT_SUMMARY_BUDGET = 4096
+
+# How long Ollama keeps a model loaded after a request. The periodic
+# analysis runs every 5 minutes, so the default keeps it resident between runs.
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Sent as the system prompt of every request. A shared prefix lets Ollama
+# reuse its cached prompt evaluation across calls.
+SYSTEM_PROMPT = (
+    "You are a senior DevOps engineer responsible for monitoring a fleet of "
+    "servers. You analyze logs, alerts and metrics and give concise, "
+    "actionable answers."
+)
+
+# Incident summaries are asked for in 3-5 sentences; generation is
+# stopped once this many are complete
+INCIDENT_SUMMARY_SENTENCES = 5
+_SENTENCE_END_RE = re.compile(r"[.!?]\s")
+
+# JSON schemas passed as Ollama's "format", which constrains decoding so the
+# analyses always parse
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+_INCIDENT_LIST = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "root_cause": {"type": "string"},
+            "affected_hosts": _STRING_LIST,
+            "related_alerts": _STRING_LIST,
+            "priority": {"type": "string", "enum": ["critical", "high", "medium", "low"]},
+        },
+        "required": ["name", "root_cause", "affected_hosts", "related_alerts", "priority"],
+    },
+}
+
+LOG_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "severity": {"type": "string", "enum": ["info", "warning", "critical"]},
+        "summary": {"type": "string"},
+        "critical_issues": _STRING_LIST,
+        "warnings": _STRING_LIST,
+        "anomalies": _STRING_LIST,
+        "recommendations": _STRING_LIST,
+    },
+    "required": ["severity", "summary", "critical_issues", "warnings", "anomalies", "recommendations"],
+}
+
+ALERT_CORRELATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "severity": {"type": "string", "enum": ["info", "warning", "critical"]},
+        "summary": {"type": "string"},
+        "incidents": _INCIDENT_LIST,
+        "recommendations": _STRING_LIST,
+    },
+    "required": ["severity", "summary", "incidents", "recommendations"],
+}
+
+COMBINED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "severity": {"type": "string", "enum": ["info", "warning", "critical"]},
+        "summary": {"type": "string"},
+        "log_findings": {
+            "type": "object",
+            "properties": {
+                "critical_issues": _STRING_LIST,
+                "warnings": _STRING_LIST,
+                "anomalies": _STRING_LIST,
+            },
+            "required": ["critical_issues", "warnings", "anomalies"],
+        },
+        "alert_incidents": _INCIDENT_LIST,
+        "recommendations": _STRING_LIST,
+    },
+    "required": ["severity", "summary", "log_findings", "alert_incidents", "recommendations"],
+}
+
+DAILY_REPORT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "executive_summary": {"type": "string"},
+        "critical_issues": _STRING_LIST,
+        "performance_notes": _STRING_LIST,
+        "capacity_notes": _STRING_LIST,
+        "recommendations": _STRING_LIST,
+    },
+    "required": [
+        "executive_summary", "critical_issues", "performance_notes",
+        "capacity_notes", "recommendations",
+    ],
+}
+
+# Prompt templates. The JSON layout of each answer is enforced by the
+# matching schema above, so the prompts only describe the content.
+_LOG_PROMPT_TEMPLATE = """Analyze the following server log summary and identify:
+1. Critical issues requiring immediate attention
+2. Warning patterns that may indicate problems
+3. Unusual activity or anomalies
+4. Security concerns
+
+Log Summary:
+{log_summary}
+
+Respond in JSON with the overall severity, a brief summary of findings, the critical issues, warnings and anomalies found, and actionable recommendations."""
+
+_ALERT_PROMPT_TEMPLATE = """Group the related infrastructure alerts below and identify:
+1. Root cause analysis - what's causing these alerts?
+2. Impact assessment - what systems are affected?
+3. Priority ranking - which issues need immediate attention?
+
+Alerts:
+{alert_text}
+
+Respond in JSON with the overall severity, a brief summary of the situation, one incident per group of related alerts (name, likely root cause, affected hosts, related alert messages, priority), and the immediate actions to take as recommendations."""
+
+_DAILY_PROMPT_TEMPLATE = """Prepare the daily infrastructure report for the team.
+
+Infrastructure Summary for {today}:
+
+Metrics:
+- Active hosts: {hosts_up}
+- Average CPU usage: {avg_cpu}%
+- Average memory usage: {avg_memory}%
+- Average disk usage: {avg_disk}%
+
+Alerts Summary:
+- Critical alerts: {critical_count}
+- High alerts: {high_count}
+- Warning alerts: {warning_count}
+
+Recent critical alerts:
+{critical_lines}
+
+Log Summary:
+- Total errors: {errors_count}
+- Total warnings: {warnings_count}
+
+
+Generate a professional daily report with:
+1. Executive summary (2-3 sentences)
+2. Critical issues requiring attention
+3. Performance observations
+4. Capacity planning notes
+5. Actionable recommendations
+
+Write in a clear, concise style suitable for a morning standup. Respond in JSON, with the recommendations as prioritized action items."""
+
+_COMBINED_PROMPT_TEMPLATE = """Review the following server logs and infrastructure alerts together.
+
+From the logs, identify:
+1. Critical issues requiring immediate attention
+2. Warning patterns that may indicate problems
+3. Unusual activity, anomalies or security concerns
+
+Group related alerts and, using the logs as supporting evidence, identify:
+1. Root cause analysis - what's causing these alerts?
+2. Impact assessment - what systems are affected?
+3. Priority ranking - which issues need immediate attention?
+
+Log Summary:
+{log_summary}
+
+Alerts:
+{alert_text}
+
+Respond in JSON with the overall severity, a brief summary of the situation, the log findings (critical issues, warnings, anomalies), one alert incident per group of related alerts (name, likely root cause, affected hosts, related alert messages, priority), and the immediate actions to take as recommendations."""
+
+_INCIDENT_PROMPT_TEMPLATE = """Summarize this infrastructure incident for the team:
+
+Incident: {name}
+Severity: {severity}
+Affected hosts: {hosts}
+Alerts: {alerts}
+
+Write a brief (3-5 sentences) summary explaining:
+1. What happened
+2. What's affected
+3. What action is needed
+
+Be concise and actionable."""
+
+# Health score deductions: (metric, ((usage %, penalty), ...)), highest
+# threshold first, plus a penalty per critical and high alert
+HEALTH_USAGE_PENALTIES = (
+    ("avg_cpu", ((80, 20), (60, 10))),
+    ("avg_memory", ((80, 20), (60, 10))),
+    ("avg_disk", ((90, 25), (80, 15))),
+)
+HEALTH_CRITICAL_ALERT_PENALTY = 10
+HEALTH_HIGH_ALERT_PENALTY = 5
+
+
+def _as_float(value) -> Optional[float]:
+    """Convert a metric value to float, or None when it is not numeric (e.g. 'N/A')."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def group_alerts_by_severity(alerts: list[dict]) -> dict[str, list[dict]]:
+    """Group alerts by severity in one pass, keeping their order."""
+    by_severity = defaultdict(list)
+    for alert in alerts:
+        by_severity[alert.get('severity')].append(alert)
+    return dict(by_severity)
+
+
+def build_logs_summary(logs: list[dict]) -> dict:
+    """Count error and warning logs in one pass."""
+    # map() and Counter both loop in C, with no Python bytecode per entry
+    by_level = Counter(map(dict.get, logs, repeat('level')))
+    return {
+        'errors_count': by_level['error'],
+        'warnings_count': by_level['warning'],
+    }
+
 
-@dataclass
+# Analyses of an identical prompt are reused for this many seconds; sticky
+# alerts and repeated log lines often produce the same prompt run after run
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", "600"))
+ANALYSIS_CACHE_SIZE = 128
+
+_SEVERITY_RANK = {"info": 0, "warning": 1, "critical": 2}
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of LLM analysis."""
     analysis_type: str
@@ -29,7 +274,7 @@ class AnalysisResult:
     timestamp: float = field(default_factory=time.time)
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyReport:
     """Daily infrastructure report."""
     date: str
@@ -53,6 +298,10 @@ class LLMAnalyzer:
     - Provide actionable recommendations
     """
 
+    # Sessions shared by all analyzers talking to the same Ollama host on the
+    # same event loop, as [session, number of analyzers using it]
+    _shared_sessions: dict[tuple[str, asyncio.AbstractEventLoop], list] = {}
+
     def __init__(
         self,
         ollama_host: str = "http://localhost:11434",
@@ -63,42 +312,153 @@ class LLMAnalyzer:
         self.ollama_host = ollama_host.rstrip('/')
         self.model = model
         self.fast_model = fast_model
+        self.system_prompt = SYSTEM_PROMPT
         self._session: Optional[aiohttp.ClientSession] = None
+        self._session_key: Optional[tuple] = None
+        # LRU of parsed analyses keyed by a hash of model and prompt
+        self._analysis_cache: OrderedDict[bytes, AnalysisResult] = OrderedDict()
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=120)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            key = (self.ollama_host, asyncio.get_running_loop())
+            shared = LLMAnalyzer._shared_sessions.get(key)
+            if shared is None or shared[0].closed:
+                timeout = aiohttp.ClientTimeout(total=120)
+                # All requests go to the single Ollama host; keep a pool of
+                # connections to it alive between analysis runs
+                connector = aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=32,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True,
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=timeout,
+                    headers={"Content-Type": "application/json"},
+                )
+                shared = [session, 0]
+                LLMAnalyzer._shared_sessions[key] = shared
+            shared[1] += 1
+            self._session = shared[0]
+            self._session_key = key
         return self._session
 
-    async def _generate(self, prompt: str, model: Optional[str] = None, temperature: float = 0.3) -> str:
-        """Generate text using Ollama."""
-        try:
-            session = await self._get_session()
-            payload = {
-                "model": model or self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                }
+    @staticmethod
+    def _cache_key(model: str, prompt: str) -> bytes:
+        return hashlib.blake2b(f"{model}\0{prompt}".encode(), digest_size=16).digest()
+
+    def _cached_analysis(self, key: bytes) -> Optional[AnalysisResult]:
+        """Return a cached analysis that has not expired."""
+        result = self._analysis_cache.get(key)
+        if result is None:
+            return None
+        if time.time() - result.timestamp >= ANALYSIS_CACHE_TTL:
+            del self._analysis_cache[key]
+            return None
+        self._analysis_cache.move_to_end(key)
+        return result
+
+    def _cache_analysis(self, key: bytes, result: AnalysisResult):
+        self._analysis_cache[key] = result
+        self._analysis_cache.move_to_end(key)
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _payload(
+        self,
+        prompt: str,
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        response_format: dict | str | None = None,
+    ) -> bytes:
+        """Encode an Ollama /api/generate request body."""
+        payload = {
+            "model": model or self.model,
+            "system": self.system_prompt,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+                "top_p": 0.9,
             }
+        }
+        if response_format is not None:
+            payload["format"] = response_format
+        return msgspec.json.encode(payload)
 
+    async def _generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 512,
+        response_format: dict | str | None = None,
+    ) -> str:
+        """Generate text using Ollama, stopping after max_tokens tokens.
+
+        ``response_format`` is passed as Ollama's ``format``: ``"json"`` or a
+        JSON schema the output must follow.
+        """
+        try:
+            session = await self._get_session()
             async with session.post(
                 f"{self.ollama_host}/api/generate",
-                json=payload,
+                data=self._payload(
+                    prompt, model, temperature, max_tokens, stream=False,
+                    response_format=response_format,
+                ),
             ) as response:
                 if response.status != 200:
                     logger.error(f"Ollama error: {await response.text()}")
                     return ""
 
-                result = await response.json()
+                result = msgspec.json.decode(await response.read())
                 return result.get("response", "")
 
         except Exception as e:
             logger.error(f"LLM generation error: {e}")
             return ""
 
+    async def _generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 512,
+    ) -> AsyncIterator[str]:
+        """Yield text from Ollama as it is generated.
+
+        Closing the generator early closes the connection, which makes
+        Ollama stop generating.
+        """
+        try:
+            session = await self._get_session()
+            async with session.post(
+                f"{self.ollama_host}/api/generate",
+                data=self._payload(prompt, model, temperature, max_tokens, stream=True),
+            ) as response:
+                if response.status != 200:
+                    logger.error(f"Ollama error: {await response.text()}")
+                    return
+
+                # One JSON object per line, the last one marked done
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    chunk = msgspec.json.decode(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+
+        except Exception as e:
+            logger.error(f"LLM generation error: {e}")
+
     async def analyze_logs(self, logs: list[dict]) -> AnalysisResult:
         """
         Analyze a batch of logs for anomalies and patterns.
@@ -116,35 +476,36 @@ class LLMAnalyzer:
                 severity="info",
             )
 
-        # Prepare log summary for LLM
-        log_summary = self._prepare_log_summary(logs)
-
-        prompt = f"""You are a DevOps expert analyzing server logs. Analyze the following log summary and identify:
-1. Critical issues requiring immediate attention
-2. Warning patterns that may indicate problems
-3. Unusual activity or anomalies
-4. Security concerns
-
-Log Summary:
-{log_summary}
-
-Provide your analysis in the following JSON format:
-{{
-    "severity": "info|warning|critical",
-    "summary": "Brief summary of findings",
-    "critical_issues": ["list of critical issues"],
-    "warnings": ["list of warnings"],
-    "anomalies": ["list of anomalies"],
-    "recommendations": ["list of actionable recommendations"]
-}}
-
-Respond only with valid JSON."""
-
-        response = await self._generate(prompt, model=self.fast_model)
+        # Large batches are split into interleaved shards analyzed
+        # concurrently, so more of the batch reaches the model
+        shards = max(1, min(LOG_ANALYSIS_SHARDS, len(logs) // LOG_SHARD_MIN_SIZE))
+        if shards == 1:
+            return await self._analyze_log_shard(logs)
+
+        results = await asyncio.gather(
+            *[self._analyze_log_shard(logs[i::shards]) for i in range(shards)]
+        )
+        return self._merge_log_results(results)
+
+    async def _analyze_log_shard(self, logs: list[dict]) -> AnalysisResult:
+        """Analyze one batch of logs with a single prompt."""
+        # Prepare log summary for LLM; it walks every entry, so build it
+        # off the event loop
+        log_summary = await asyncio.to_thread(self._prepare_log_summary, logs)
+
+        prompt = _LOG_PROMPT_TEMPLATE.format(log_summary=log_summary)
+        cache_key = self._cache_key(self.fast_model, prompt)
+        cached = self._cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._generate(
+            prompt, model=self.fast_model, response_format=LOG_ANALYSIS_SCHEMA
+        )
 
         try:
-            result = json.loads(response)
-            return AnalysisResult(
+            result = msgspec.json.decode(response)
+            analysis = AnalysisResult(
                 analysis_type="logs",
                 summary=result.get("summary", "Analysis complete"),
                 severity=result.get("severity", "info"),
@@ -155,13 +516,39 @@ Respond only with valid JSON."""
                 },
                 recommendations=result.get("recommendations", []),
             )
-        except json.JSONDecodeError:
+        except msgspec.DecodeError:
             return AnalysisResult(
                 analysis_type="logs",
                 summary=response[:500] if response else "Analysis failed",
                 severity="info",
             )
 
+        self._cache_analysis(cache_key, analysis)
+        return analysis
+
+    @staticmethod
+    def _merge_log_results(results: list[AnalysisResult]) -> AnalysisResult:
+        """Merge per-shard log analyses into one result."""
+        details = {"critical_issues": [], "warnings": [], "anomalies": []}
+        recommendations = []
+        for result in results:
+            for key, items in details.items():
+                items.extend(result.details.get(key, []))
+            for recommendation in result.recommendations:
+                if recommendation not in recommendations:
+                    recommendations.append(recommendation)
+
+        return AnalysisResult(
+            analysis_type="logs",
+            summary=" ".join(r.summary for r in results),
+            severity=max(
+                (r.severity for r in results),
+                key=lambda severity: _SEVERITY_RANK.get(severity, 0),
+            ),
+            details=details,
+            recommendations=recommendations,
+        )
+
     async def correlate_alerts(self, alerts: list[dict]) -> AnalysisResult:
         """
         Correlate related alerts to identify root causes.
@@ -180,39 +567,21 @@ Respond only with valid JSON."""
             )
 
         # Group alerts by host and time
-        alert_text = self._prepare_alert_summary(alerts)
-
-        prompt = f"""You are a DevOps expert analyzing infrastructure alerts. Group related alerts and identify:
-1. Root cause analysis - what's causing these alerts?
-2. Impact assessment - what systems are affected?
-3. Priority ranking - which issues need immediate attention?
-
-Alerts:
-{alert_text}
+        alert_text = await asyncio.to_thread(self._prepare_alert_summary, alerts)
 
-Provide your analysis in the following JSON format:
-{{
-    "severity": "info|warning|critical",
-    "summary": "Brief summary of the situation",
-    "incidents": [
-        {{
-            "name": "Incident name",
-            "root_cause": "Likely root cause",
-            "affected_hosts": ["list of hosts"],
-            "related_alerts": ["list of related alert messages"],
-            "priority": "critical|high|medium|low"
-        }}
-    ],
-    "recommendations": ["list of immediate actions to take"]
-}}
-
-Respond only with valid JSON."""
+        prompt = _ALERT_PROMPT_TEMPLATE.format(alert_text=alert_text)
+        cache_key = self._cache_key(self.model, prompt)
+        cached = self._cached_analysis(cache_key)
+        if cached is not None:
+            return cached
 
-        response = await self._generate(prompt)
+        response = await self._generate(
+            prompt, max_tokens=1024, response_format=ALERT_CORRELATION_SCHEMA
+        )
 
         try:
-            result = json.loads(response)
-            return AnalysisResult(
+            result = msgspec.json.decode(response)
+            analysis = AnalysisResult(
                 analysis_type="alert_correlation",
                 summary=result.get("summary", "Correlation complete"),
                 severity=result.get("severity", "warning"),
@@ -221,18 +590,80 @@ Respond only with valid JSON."""
                 },
                 recommendations=result.get("recommendations", []),
             )
-        except json.JSONDecodeError:
+        except msgspec.DecodeError:
             return AnalysisResult(
                 analysis_type="alert_correlation",
                 summary=response[:500] if response else "Correlation failed",
                 severity="warning",
             )
 
+        self._cache_analysis(cache_key, analysis)
+        return analysis
+
+    async def analyze_combined(self, logs: list[dict], alerts: list[dict]) -> AnalysisResult:
+        """
+        Analyze logs and correlate alerts with a single prompt.
+
+        Both share the same infrastructure context, so one call avoids paying
+        for prompt evaluation twice.
+
+        Args:
+            logs: List of log entries with level, message, source, host
+            alerts: List of alerts with metric, severity, message, host
+
+        Returns:
+            Analysis with log findings and correlated incidents
+        """
+        if not logs:
+            return await self.correlate_alerts(alerts)
+        if not alerts:
+            return await self.analyze_logs(logs)
+
+        log_summary, alert_text = await asyncio.gather(
+            asyncio.to_thread(self._prepare_log_summary, logs),
+            asyncio.to_thread(self._prepare_alert_summary, alerts),
+        )
+        prompt = _COMBINED_PROMPT_TEMPLATE.format(log_summary=log_summary, alert_text=alert_text)
+        cache_key = self._cache_key(self.model, prompt)
+        cached = self._cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._generate(
+            prompt, max_tokens=1536, response_format=COMBINED_ANALYSIS_SCHEMA
+        )
+
+        try:
+            result = msgspec.json.decode(response)
+            log_findings = result.get("log_findings", {})
+            analysis = AnalysisResult(
+                analysis_type="combined",
+                summary=result.get("summary", "Analysis complete"),
+                severity=result.get("severity", "warning"),
+                details={
+                    "critical_issues": log_findings.get("critical_issues", []),
+                    "warnings": log_findings.get("warnings", []),
+                    "anomalies": log_findings.get("anomalies", []),
+                    "incidents": result.get("alert_incidents", []),
+                },
+                recommendations=result.get("recommendations", []),
+            )
+        except msgspec.DecodeError:
+            return AnalysisResult(
+                analysis_type="combined",
+                summary=response[:500] if response else "Analysis failed",
+                severity="warning",
+            )
+
+        self._cache_analysis(cache_key, analysis)
+        return analysis
+
     async def generate_daily_report(
         self,
         metrics_summary: dict,
         alerts: list[dict],
         logs_summary: dict,
+        alerts_by_severity: Optional[dict[str, list[dict]]] = None,
     ) -> DailyReport:
         """
         Generate a comprehensive daily report.
@@ -241,65 +672,47 @@ Respond only with valid JSON."""
             metrics_summary: Summary of key metrics (CPU, memory, disk)
             alerts: List of alerts from the day
             logs_summary: Summary of log analysis
+            alerts_by_severity: The alerts already grouped with
+                group_alerts_by_severity, if the caller has them
 
         Returns:
             Daily report with health score and recommendations
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-
-        # Calculate health score
-        health_score = self._calculate_health_score(metrics_summary, alerts)
-
-        # Prepare context for LLM
-        context = f"""Infrastructure Summary for {today}:
-
-Metrics:
-- Active hosts: {metrics_summary.get('hosts_up', 'N/A')}
-- Average CPU usage: {metrics_summary.get('avg_cpu', 'N/A')}%
-- Average memory usage: {metrics_summary.get('avg_memory', 'N/A')}%
-- Average disk usage: {metrics_summary.get('avg_disk', 'N/A')}%
-
-Alerts Summary:
-- Critical alerts: {len([a for a in alerts if a.get('severity') == 'critical'])}
-- High alerts: {len([a for a in alerts if a.get('severity') == 'high'])}
-- Warning alerts: {len([a for a in alerts if a.get('severity') == 'warning'])}
-
-Recent critical alerts:
-{chr(10).join([f"- {a.get('host', 'unknown')}: {a.get('message', '')}" for a in alerts if a.get('severity') == 'critical'][:5])}
-
-Log Summary:
-- Total errors: {logs_summary.get('errors_count', 0)}
-- Total warnings: {logs_summary.get('warnings_count', 0)}
-"""
-
-        prompt = f"""You are a senior DevOps engineer preparing a daily infrastructure report for the team.
-
-{context}
-
-Generate a professional daily report with:
-1. Executive summary (2-3 sentences)
-2. Critical issues requiring attention
-3. Performance observations
-4. Capacity planning notes
-5. Actionable recommendations
-
-Write in a clear, concise style suitable for a morning standup.
-
-Provide your report in JSON format:
-{{
-    "executive_summary": "2-3 sentence overview",
-    "critical_issues": ["list of critical issues"],
-    "performance_notes": ["notable performance observations"],
-    "capacity_notes": ["capacity and trend observations"],
-    "recommendations": ["prioritized action items"]
-}}
+        # Local date, matching the local 8:00 schedule of the daily report
+        today = date.today().isoformat()
 
-Respond only with valid JSON."""
+        # Count alerts by severity and pick out the first critical ones
+        if alerts_by_severity is None:
+            alerts_by_severity = group_alerts_by_severity(alerts)
+        alert_counts = {severity: len(items) for severity, items in alerts_by_severity.items()}
+        critical_alerts = alerts_by_severity.get('critical', [])[:5]
 
-        response = await self._generate(prompt)
+        # Calculate health score
+        health_score = self._calculate_health_score(metrics_summary, alert_counts)
+        critical_lines = "\n".join(
+            [f"- {a.get('host', 'unknown')}: {a.get('message', '')}" for a in critical_alerts]
+        )
+
+        prompt = _DAILY_PROMPT_TEMPLATE.format(
+            today=today,
+            hosts_up=metrics_summary.get('hosts_up', 'N/A'),
+            avg_cpu=metrics_summary.get('avg_cpu', 'N/A'),
+            avg_memory=metrics_summary.get('avg_memory', 'N/A'),
+            avg_disk=metrics_summary.get('avg_disk', 'N/A'),
+            critical_count=alert_counts.get('critical', 0),
+            high_count=alert_counts.get('high', 0),
+            warning_count=alert_counts.get('warning', 0),
+            critical_lines=critical_lines,
+            errors_count=logs_summary.get('errors_count', 0),
+            warnings_count=logs_summary.get('warnings_count', 0),
+        )
+
+        response = await self._generate(
+            prompt, max_tokens=1024, response_format=DAILY_REPORT_SCHEMA
+        )
 
         try:
-            result = json.loads(response)
+            result = msgspec.json.decode(response)
             return DailyReport(
                 date=today,
                 health_score=health_score,
@@ -309,12 +722,12 @@ Respond only with valid JSON."""
                 resource_usage=metrics_summary,
                 recommendations=result.get("recommendations", []),
             )
-        except json.JSONDecodeError:
+        except msgspec.DecodeError:
             return DailyReport(
                 date=today,
                 health_score=health_score,
                 summary=f"Infrastructure health score: {health_score}/100. {response[:200] if response else 'Report generation incomplete.'}",
-                critical_issues=[a.get('message', '') for a in alerts if a.get('severity') == 'critical'][:5],
+                critical_issues=[a.get('message', '') for a in critical_alerts],
                 warnings=[],
                 resource_usage=metrics_summary,
                 recommendations=["Review critical alerts", "Check system logs for errors"],
@@ -322,85 +735,98 @@ Respond only with valid JSON."""
 
     async def generate_incident_summary(self, incident: dict) -> str:
         """Generate a human-readable incident summary."""
-        prompt = f"""Summarize this infrastructure incident for the team:
-
-Incident: {incident.get('name', 'Unknown')}
-Severity: {incident.get('severity', 'Unknown')}
-Affected hosts: {', '.join(incident.get('hosts', []))}
-Alerts: {json.dumps(incident.get('alerts', []))}
-
-Write a brief (3-5 sentences) summary explaining:
-1. What happened
-2. What's affected
-3. What action is needed
-
-Be concise and actionable."""
-
-        return await self._generate(prompt, model=self.fast_model, temperature=0.2)
+        prompt = _INCIDENT_PROMPT_TEMPLATE.format(
+            name=incident.get('name', 'Unknown'),
+            severity=incident.get('severity', 'Unknown'),
+            hosts=', '.join(incident.get('hosts', [])),
+            alerts=msgspec.json.encode(incident.get('alerts', [])).decode(),
+        )
+
+        summary = ""
+        sentences = 0
+        stream = self._generate_stream(
+            prompt, model=self.fast_model, temperature=0.2, max_tokens=256
+        )
+        async with aclosing(stream):
+            async for text in stream:
+                # Rescan from the previous chunk's last character: a "." that
+                # ended it only closes a sentence if this chunk opens with
+                # whitespace ("3." + "5 GB" is a decimal, not a boundary)
+                start = max(len(summary) - 1, 0)
+                summary += text
+                for match in _SENTENCE_END_RE.finditer(summary, start):
+                    sentences += 1
+                    # Stop at a sentence boundary once the summary is long enough
+                    if sentences >= INCIDENT_SUMMARY_SENTENCES:
+                        return summary[:match.start() + 1]
+        return summary
 
     def _prepare_log_summary(self, logs: list[dict]) -> str:
         """Prepare a condensed log summary for LLM analysis."""
-        # Group by level
+        # Group by level, keeping up to 10 messages per level
         by_level = {'critical': [], 'error': [], 'warning': []}
+        counts = dict.fromkeys(by_level, 0)
 
         for log in logs:
             level = log.get('level', 'info').lower()
-            if level in by_level:
-                msg = f"[{log.get('host', 'unknown')}] {log.get('message', '')[:200]}"
-                by_level[level].append(msg)
-
-        summary_parts = []
+            messages = by_level.get(level)
+            if messages is None:
+                continue
+            counts[level] += 1
+            if len(messages) < 10:
+                messages.append(f"[{log.get('host', 'unknown')}] {log.get('message', '')[:200]}")
+
+        # Written straight into one buffer, stopping at the prompt budget
+        buf = io.StringIO()
         for level, messages in by_level.items():
-            if messages:
-                summary_parts.append(f"\n{level.upper()} ({len(messages)} entries):")
-                for msg in messages[:10]:  # Limit to 10 per level
-                    summary_parts.append(f"  - {msg}")
+            if not messages:
+                continue
+            if buf.tell():
+                buf.write("\n")
+            buf.write(f"\n{level.upper()} ({counts[level]} entries):")
+            for msg in messages:
+                if buf.tell() + len(msg) + 5 > PROMPT_SUMMARY_BUDGET:
+                    break
+                buf.write("\n  - ")
+                buf.write(msg)
+            if buf.tell() >= PROMPT_SUMMARY_BUDGET:
+                break
 
-        return "\n".join(summary_parts) if summary_parts else "No significant log entries"
+        return buf.getvalue() or "No significant log entries"
 
     def _prepare_alert_summary(self, alerts: list[dict]) -> str:
         """Prepare alert summary for correlation."""
-        lines = []
+        buf = io.StringIO()
         for alert in alerts[:30]:  # Limit to 30 alerts
-            lines.append(
+            line = (
                 f"[{alert.get('severity', 'unknown').upper()}] "
                 f"{alert.get('host', 'unknown')}: "
                 f"{alert.get('message', '')}"
             )
-        return "\n".join(lines)
+            if buf.tell() + len(line) + 1 > PROMPT_SUMMARY_BUDGET:
+                break
+            if buf.tell():
+                buf.write("\n")
+            buf.write(line)
+        return buf.getvalue()
 
-    def _calculate_health_score(self, metrics: dict, alerts: list[dict]) -> int:
-        """Calculate infrastructure health score (0-100)."""
+    def _calculate_health_score(self, metrics: dict, alert_counts: dict[str, int]) -> int:
+        """Calculate infrastructure health score (0-100) from metrics and alert counts per severity."""
         score = 100
 
-        # Deduct for high resource usage
-        try:
-            cpu = float(metrics.get('avg_cpu', 0))
-            if cpu > 80:
-                score -= 20
-            elif cpu > 60:
-                score -= 10
-
-            memory = float(metrics.get('avg_memory', 0))
-            if memory > 80:
-                score -= 20
-            elif memory > 60:
-                score -= 10
-
-            disk = float(metrics.get('avg_disk', 0))
-            if disk > 90:
-                score -= 25
-            elif disk > 80:
-                score -= 15
-        except (ValueError, TypeError):
-            pass
+        # Deduct for high resource usage, applying the first threshold exceeded
+        for key, thresholds in HEALTH_USAGE_PENALTIES:
+            usage = _as_float(metrics.get(key, 0))
+            if usage is None:
+                continue
+            for threshold, penalty in thresholds:
+                if usage > threshold:
+                    score -= penalty
+                    break
 
         # Deduct for alerts
-        critical_count = len([a for a in alerts if a.get('severity') == 'critical'])
-        high_count = len([a for a in alerts if a.get('severity') == 'high'])
-
-        score -= critical_count * 10
-        score -= high_count * 5
+        score -= alert_counts.get('critical', 0) * HEALTH_CRITICAL_ALERT_PENALTY
+        score -= alert_counts.get('high', 0) * HEALTH_HIGH_ALERT_PENALTY
 
         return max(0, min(100, score))
 
@@ -414,9 +840,18 @@ Be concise and actionable."""
             return False
 
     async def close(self):
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Release the HTTP session, closing it when no other analyzer uses it."""
+        if self._session_key is None:
+            return
+
+        shared = LLMAnalyzer._shared_sessions.get(self._session_key)
+        if shared is not None and shared[0] is self._session:
+            shared[1] -= 1
+            if shared[1] <= 0:
+                del LLMAnalyzer._shared_sessions[self._session_key]
+                await self._session.close()
+        self._session = None
+        self._session_key = None
 
 
 # Scheduled analyzer for background analysis
@@ -438,32 +873,44 @@ class ScheduledAnalyzer:
         self.get_metrics = get_metrics_fn
         self.report_callback = report_callback
         self._running = False
+        # Kept so the loops are not garbage collected and can be cancelled
+        self._tasks: list[asyncio.Task] = []
 
     async def start(self):
         """Start the scheduled analyzer."""
         self._running = True
-        asyncio.create_task(self._run_periodic_analysis())
-        asyncio.create_task(self._run_daily_report())
+        self._tasks = [
+            asyncio.create_task(self._run_periodic_analysis()),
+            asyncio.create_task(self._run_daily_report()),
+        ]
 
     async def stop(self):
         """Stop the scheduled analyzer."""
         self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
 
     async def _run_periodic_analysis(self):
         """Run analysis every 5 minutes."""
+        next_run = time.monotonic()
         while self._running:
-            await asyncio.sleep(300)  # 5 minutes
+            # Runs start every 5 minutes, however long the previous one
+            # took; a run that overran is followed immediately, not in a burst
+            next_run = max(next_run + 300, time.monotonic())
+            await asyncio.sleep(max(0.0, next_run - time.monotonic()))
 
             try:
-                # Get recent alerts
-                alerts = await self.get_alerts(100)
+                # Get recent alerts and logs
+                alerts, logs = await asyncio.gather(self.get_alerts(100), self.get_logs(500))
 
-                if alerts:
-                    # Correlate alerts
-                    result = await self.analyzer.correlate_alerts(alerts)
+                # Analyze logs and correlate alerts in one model call
+                if alerts or logs:
+                    result = await self.analyzer.analyze_combined(logs, alerts)
 
                     if result.severity in ('critical', 'warning'):
-                        logger.info(f"Alert correlation: {result.summary}")
+                        logger.info(f"{result.analysis_type} analysis: {result.summary}")
 
                         if self.report_callback:
                             await self.report_callback(result)
@@ -478,7 +925,7 @@ class ScheduledAnalyzer:
             now = datetime.now()
             target = now.replace(hour=8, minute=0, second=0, microsecond=0)
             if now >= target:
-                target = target.replace(day=target.day + 1)
+                target += timedelta(days=1)
 
             wait_seconds = (target - now).total_seconds()
             await asyncio.sleep(wait_seconds)
@@ -492,16 +939,19 @@ class ScheduledAnalyzer:
                 alerts = await self.get_alerts(500)
                 logs = await self.get_logs(1000)
 
-                logs_summary = {
-                    'errors_count': len([l for l in logs if l.get('level') == 'error']),
-                    'warnings_count': len([l for l in logs if l.get('level') == 'warning']),
-                }
+                # One pass over each list, off the event loop; the report
+                # reuses the groups
+                logs_summary, alerts_by_severity = await asyncio.gather(
+                    asyncio.to_thread(build_logs_summary, logs),
+                    asyncio.to_thread(group_alerts_by_severity, alerts),
+                )
 
                 # Generate report
                 report = await self.analyzer.generate_daily_report(
                     metrics_summary=metrics,
                     alerts=alerts,
                     logs_summary=logs_summary,
+                    alerts_by_severity=alerts_by_severity,
                 )
 
                 logger.info(f"Daily report generated: Health score {report.health_score}/100")
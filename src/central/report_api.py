@@ -5,20 +5,29 @@ Advanced dashboard with real-time metrics, AI analysis, filtering, and multi-net
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
+import re
 import time
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Optional, Dict, List
-from collections import defaultdict
+from collections import OrderedDict
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # responses and prompts fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -26,6 +35,10 @@ VICTORIAMETRICS_URL = os.getenv("VICTORIAMETRICS_URL", "http://localhost:8428")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "devstral")
 INGEST_API_URL = os.getenv("INGEST_API_URL", "http://localhost:8200")
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "32"))
+LLM_CACHE_TTL = int(os.getenv("REPORT_LLM_CACHE_TTL", "60"))
+LLM_CACHE_SIZE = 256
+COLLECT_CACHE_TTL = float(os.getenv("REPORT_COLLECT_CACHE_TTL", "10"))
 
 # Network Configuration - All Sidra Networks
 NETWORK_CONFIG = {
@@ -73,23 +86,73 @@ NETWORK_CONFIG = {
 }
 
 
-def get_network_for_host(hostname: str) -> dict:
-    """Determine network info from hostname or IP."""
+_UNKNOWN_NETWORK = {"network": "unknown", "network_name": "Unknown", "color": "#666", "role": "compute"}
+
+
+def _build_host_index() -> Dict[str, dict]:
+    """Map every configured server name and IP to its merged network info."""
+    index: Dict[str, dict] = {}
     for prefix, config in NETWORK_CONFIG.items():
         for ip, server_info in config.get("servers", {}).items():
-            if server_info.get("name") == hostname or hostname == ip:
-                return {
-                    "network": prefix,
-                    "network_name": config["name"],
-                    "color": config["color"],
-                    "role": server_info.get("role", "compute"),
-                    "ip": ip,
-                    **server_info
-                }
-    # Try to extract network from hostname pattern
-    if "server" in hostname.lower():
-        return {"network": "unknown", "network_name": "Unknown", "color": "#666", "role": "compute"}
-    return {"network": "unknown", "network_name": "Unknown", "color": "#666", "role": "compute"}
+            info = {
+                "network": prefix,
+                "network_name": config["name"],
+                "color": config["color"],
+                "role": server_info.get("role", "compute"),
+                "ip": ip,
+                **server_info
+            }
+            # First configured match wins for duplicated names
+            index.setdefault(server_info.get("name"), info)
+            index.setdefault(ip, info)
+    return index
+
+
+_HOST_INDEX = _build_host_index()
+
+
+def get_network_for_host(hostname: str) -> dict:
+    """Determine network info from hostname or IP."""
+    return _HOST_INDEX.get(hostname, _UNKNOWN_NETWORK)
+
+
+# Shared keep-alive session for VictoriaMetrics, ingest API and Ollama calls,
+# opened by the app lifespan
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_LIMIT, keepalive_timeout=60)
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared HTTP session."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+def _dumps_indented(obj) -> str:
+    """Serialize obj as 2-space indented JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+class OrjsonJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
 
 
 class ReportResponse(BaseModel):
@@ -102,36 +165,33 @@ class ReportResponse(BaseModel):
 
 async def query_victoriametrics(query: str, time_range: str = "5m") -> dict:
     """Query VictoriaMetrics."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{VICTORIAMETRICS_URL}/api/v1/query",
-            params={"query": query}
-        ) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            return {}
+    async with get_session().get(
+        f"{VICTORIAMETRICS_URL}/api/v1/query",
+        params={"query": query}
+    ) as resp:
+        if resp.status == 200:
+            return await resp.json()
+        return {}
 
 
 async def query_victoriametrics_range(query: str, start: str, end: str, step: str = "60s") -> dict:
     """Query VictoriaMetrics for range data."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{VICTORIAMETRICS_URL}/api/v1/query_range",
-            params={"query": query, "start": start, "end": end, "step": step}
-        ) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            return {}
+    async with get_session().get(
+        f"{VICTORIAMETRICS_URL}/api/v1/query_range",
+        params={"query": query, "start": start, "end": end, "step": step}
+    ) as resp:
+        if resp.status == 200:
+            return await resp.json()
+        return {}
 
 
 async def get_alerts() -> list:
     """Get recent alerts from ingest API."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{INGEST_API_URL}/api/v1/alerts/recent?count=100") as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("alerts", [])
+        async with get_session().get(f"{INGEST_API_URL}/api/v1/alerts/recent?count=100") as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return data.get("alerts", [])
     except:
         pass
     return []
@@ -144,203 +204,300 @@ async def get_uptime_stats() -> dict:
     return stats
 
 
+# Ollama responses keyed by exact prompt hash (L1) and by a coarse prompt
+# hash (L2) under which nearly identical infrastructure states collide
+_llm_cache: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+_ISO_TIMESTAMP_RE = re.compile(r"\d{4}-\d\d-\d\dT[\d:.+-]+")
+_DECIMAL_RE = re.compile(r"(?<![\w.])\d+\.\d+(?![\w.])")
+# Summary statistic lines of the report prompts ("- CPU avg: 41.3%, ...")
+_STAT_LINE_RE = re.compile(r"^- .*$", re.MULTILINE)
+
+
+def _round_decimals(match: re.Match) -> str:
+    return _DECIMAL_RE.sub(lambda m: str(round(float(m.group()) / 5) * 5), match.group())
+
+
+def _coarse_prompt(prompt: str) -> str:
+    """Drop timestamps and round decimal readings on statistic lines to the nearest 5.
+
+    Integer counts (hosts, alerts, GPUs) and the issue lines are kept exact,
+    so that a coarse hit never hides a new alert or an issue escalating from
+    warning to critical.
+    """
+    prompt = _ISO_TIMESTAMP_RE.sub("", prompt)
+    return _STAT_LINE_RE.sub(_round_decimals, prompt)
+
+
+def _llm_cache_keys(prompt: str) -> tuple[bytes, bytes]:
+    exact = hashlib.blake2b(f"{OLLAMA_MODEL}\0{prompt}".encode(), digest_size=16).digest()
+    coarse = hashlib.blake2b(
+        f"{OLLAMA_MODEL}\0{_coarse_prompt(prompt)}".encode(), digest_size=16, person=b"coarse"
+    ).digest()
+    return exact, coarse
+
+
+def _cached_llm_report(keys: tuple[bytes, ...]) -> Optional[str]:
+    """Return the first unexpired cached response under any of the keys."""
+    now = time.monotonic()
+    for key in keys:
+        entry = _llm_cache.get(key)
+        if entry is None:
+            continue
+        if now - entry[0] >= LLM_CACHE_TTL:
+            del _llm_cache[key]
+            continue
+        _llm_cache.move_to_end(key)
+        return entry[1]
+    return None
+
+
+def _cache_llm_report(keys: tuple[bytes, ...], response: str):
+    entry = (time.monotonic(), response)
+    for key in keys:
+        _llm_cache[key] = entry
+        _llm_cache.move_to_end(key)
+    while len(_llm_cache) > LLM_CACHE_SIZE:
+        _llm_cache.popitem(last=False)
+
+
 async def generate_llm_report(prompt: str) -> str:
-    """Generate report using Ollama LLM."""
+    """Generate report using Ollama LLM, reusing recent responses for similar prompts."""
+    cache_keys = _llm_cache_keys(prompt) if LLM_CACHE_TTL > 0 else ()
+    cached = _cached_llm_report(cache_keys)
+    if cached is not None:
+        return cached
+
     try:
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "options": {"temperature": 0.3, "num_predict": 500}
-            }
-            async with session.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=120)
-            ) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    return result.get("response", "")
+        payload = {
+            "model": OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": 0.3, "num_predict": 500}
+        }
+        async with get_session().post(
+            f"{OLLAMA_HOST}/api/generate",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=120)
+        ) as resp:
+            if resp.status == 200:
+                result = await resp.json()
+                response = result.get("response", "")
+                if response:
+                    _cache_llm_report(cache_keys, response)
+                return response
     except Exception as e:
         logger.error(f"LLM generation error: {e}")
     return ""
 
 
+# Per-host and per-GPU metrics and the record fields they fill. Each group is
+# fetched with a single __name__ regex query and demultiplexed by metric name.
+HOST_METRIC_FIELDS = {
+    "sidra_cpu_percent": "cpu",
+    "sidra_memory_percent": "memory",
+    "sidra_disk_percent": "disk",
+    "sidra_net_bytes_sent": "net_sent",
+    "sidra_net_bytes_recv": "net_recv",
+    "sidra_load_1m": "load_1m",
+}
+GPU_METRIC_FIELDS = {
+    "sidra_gpu_temp": "temp",
+    "sidra_gpu_util": "util",
+    "sidra_gpu_memory_used": "memory_used",
+    "sidra_gpu_memory_total": "memory_total",
+}
+
+
+def _metric_names_query(names) -> str:
+    """Build a selector matching every series of the given metric names."""
+    return '{__name__=~"%s"}' % "|".join(map(re.escape, names))
+
+
+HOST_METRICS_QUERY = _metric_names_query(HOST_METRIC_FIELDS)
+GPU_METRICS_QUERY = _metric_names_query(GPU_METRIC_FIELDS)
+
+
+def _series_by_metric(*results: dict) -> dict[str, list]:
+    """Group the series of instant query results by metric name."""
+    grouped: dict[str, list] = {}
+    for result in results:
+        for r in result.get("data", {}).get("result") or ():
+            grouped.setdefault(r["metric"].get("__name__", ""), []).append(r)
+    return grouped
+
+
 async def collect_infrastructure_data() -> dict:
     """Collect all infrastructure metrics with network classification."""
+    now = datetime.now()
     data = {
-        "timestamp": datetime.now().isoformat(),
-        "server_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z"),
+        "timestamp": now.isoformat(),
+        "server_time": now.strftime("%Y-%m-%d %H:%M:%S %Z"),
         "hosts": [],
         "gpus": [],
         "alerts": [],
-        "networks": defaultdict(lambda: {"hosts": [], "stats": {}}),
+        "networks": {},
         "summary": {},
         "trends": {}
     }
 
+    # Fan out the metric queries and the alerts fetch at once
+    count_result, host_result, gpu_result, data["alerts"] = await asyncio.gather(
+        query_victoriametrics("count(sidra_cpu_percent)"),
+        query_victoriametrics(HOST_METRICS_QUERY),
+        query_victoriametrics(GPU_METRICS_QUERY),
+        get_alerts(),
+    )
+    series = _series_by_metric(host_result, gpu_result)
+
     # Get host count
-    result = await query_victoriametrics("count(sidra_cpu_percent)")
+    result = count_result
     if result.get("data", {}).get("result"):
         data["summary"]["host_count"] = int(float(result["data"]["result"][0]["value"][1]))
 
     # Get CPU metrics per host
-    result = await query_victoriametrics("sidra_cpu_percent")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            cpu = float(r["value"][1])
-            network_info = get_network_for_host(host)
-            host_data = {
-                "name": host,
-                "cpu": cpu,
-                "network": network_info["network"],
-                "network_name": network_info["network_name"],
-                "network_color": network_info["color"],
-                "role": network_info.get("role", "compute"),
-                "ip": network_info.get("ip", ""),
-            }
-            data["hosts"].append(host_data)
+    for r in series.get("sidra_cpu_percent", ()):
+        host = r["metric"].get("host", "unknown")
+        cpu = float(r["value"][1])
+        network_info = get_network_for_host(host)
+        host_data = {
+            "name": host,
+            "cpu": cpu,
+            "network": network_info["network"],
+            "network_name": network_info["network_name"],
+            "network_color": network_info["color"],
+            "role": network_info.get("role", "compute"),
+            "ip": network_info.get("ip", ""),
+        }
+        data["hosts"].append(host_data)
 
-    # Get memory metrics
-    result = await query_victoriametrics("sidra_memory_percent")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            mem = float(r["value"][1])
-            for h in data["hosts"]:
-                if h["name"] == host:
-                    h["memory"] = mem
-                    break
-
-    # Get disk metrics
-    result = await query_victoriametrics("sidra_disk_percent")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            disk = float(r["value"][1])
-            for h in data["hosts"]:
-                if h["name"] == host:
-                    h["disk"] = disk
-                    break
-
-    # Get network I/O
-    result = await query_victoriametrics("sidra_net_bytes_sent")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            net_sent = float(r["value"][1])
-            for h in data["hosts"]:
-                if h["name"] == host:
-                    h["net_sent"] = net_sent
-                    break
-
-    result = await query_victoriametrics("sidra_net_bytes_recv")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            net_recv = float(r["value"][1])
-            for h in data["hosts"]:
-                if h["name"] == host:
-                    h["net_recv"] = net_recv
-                    break
-
-    # Get load average
-    result = await query_victoriametrics("sidra_load_1m")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            load = float(r["value"][1])
-            for h in data["hosts"]:
-                if h["name"] == host:
-                    h["load_1m"] = load
-                    break
+    # Merge the remaining per-host metrics through a name index,
+    # keeping the first series seen for each host
+    host_by_name = {}
+    for h in data["hosts"]:
+        host_by_name.setdefault(h["name"], h)
+    for name, field in HOST_METRIC_FIELDS.items():
+        if field == "cpu":
+            continue
+        for r in series.get(name, ()):
+            h = host_by_name.get(r["metric"].get("host", "unknown"))
+            if h is not None:
+                h[field] = float(r["value"][1])
 
     # Get GPU metrics
-    result = await query_victoriametrics("sidra_gpu_temp")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            network_info = get_network_for_host(r["metric"].get("host", "unknown"))
-            data["gpus"].append({
-                "host": r["metric"].get("host", "unknown"),
-                "name": r["metric"].get("name", "unknown"),
-                "index": r["metric"].get("gpu", "0"),
-                "temp": float(r["value"][1]),
-                "network": network_info["network"],
-                "network_name": network_info["network_name"],
-            })
-
-    # Get GPU utilization
-    result = await query_victoriametrics("sidra_gpu_util")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            gpu_idx = r["metric"].get("gpu", "0")
-            util = float(r["value"][1])
-            for g in data["gpus"]:
-                if g["host"] == host and g["index"] == gpu_idx:
-                    g["util"] = util
-                    break
-
-    # Get GPU memory
-    result = await query_victoriametrics("sidra_gpu_memory_used")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            gpu_idx = r["metric"].get("gpu", "0")
-            mem_used = float(r["value"][1])
-            for g in data["gpus"]:
-                if g["host"] == host and g["index"] == gpu_idx:
-                    g["memory_used"] = mem_used
-                    break
-
-    result = await query_victoriametrics("sidra_gpu_memory_total")
-    if result.get("data", {}).get("result"):
-        for r in result["data"]["result"]:
-            host = r["metric"].get("host", "unknown")
-            gpu_idx = r["metric"].get("gpu", "0")
-            mem_total = float(r["value"][1])
-            for g in data["gpus"]:
-                if g["host"] == host and g["index"] == gpu_idx:
-                    g["memory_total"] = mem_total
-                    g["memory_percent"] = round((g.get("memory_used", 0) / mem_total * 100), 1) if mem_total > 0 else 0
-                    break
-
-    # Get alerts
-    data["alerts"] = await get_alerts()
-
-    # Classify hosts by network
+    for r in series.get("sidra_gpu_temp", ()):
+        network_info = get_network_for_host(r["metric"].get("host", "unknown"))
+        data["gpus"].append({
+            "host": r["metric"].get("host", "unknown"),
+            "name": r["metric"].get("name", "unknown"),
+            "index": r["metric"].get("gpu", "0"),
+            "temp": float(r["value"][1]),
+            "network": network_info["network"],
+            "network_name": network_info["network_name"],
+        })
+
+    # Merge GPU utilization and memory through a (host, index) index
+    gpu_by_key = {}
+    for g in data["gpus"]:
+        gpu_by_key.setdefault((g["host"], g["index"]), g)
+    for name, field in GPU_METRIC_FIELDS.items():
+        if field == "temp":
+            continue
+        for r in series.get(name, ()):
+            g = gpu_by_key.get((r["metric"].get("host", "unknown"), r["metric"].get("gpu", "0")))
+            if g is not None:
+                g[field] = float(r["value"][1])
+
+    for g in gpu_by_key.values():
+        mem_total = g.get("memory_total")
+        if mem_total is not None:
+            g["memory_percent"] = round((g.get("memory_used", 0) / mem_total * 100), 1) if mem_total > 0 else 0
+
+    # Classify hosts by network, accumulate per-network and overall
+    # statistics and identify issues in a single pass
+    cpu_sum = mem_sum = disk_sum = load_sum = 0
+    cpu_min = mem_min = disk_min = float("inf")
+    cpu_max = mem_max = disk_max = float("-inf")
+    # network -> [cpu_sum, mem_sum, disk_sum, cpu_max, mem_max, disk_max]
+    net_totals = {}
+    issues = []
     for h in data["hosts"]:
+        cpu = h.get("cpu", 0)
+        mem = h.get("memory", 0)
+        disk = h.get("disk", 0)
+
         network = h.get("network", "unknown")
-        data["networks"][network]["hosts"].append(h)
+        bucket = data["networks"].get(network)
+        if bucket is None:
+            bucket = data["networks"][network] = {"hosts": [], "stats": {}}
+        bucket["hosts"].append(h)
+        totals = net_totals.get(network)
+        if totals is None:
+            net_totals[network] = [cpu, mem, disk, cpu, mem, disk]
+        else:
+            totals[0] += cpu
+            totals[1] += mem
+            totals[2] += disk
+            if cpu > totals[3]:
+                totals[3] = cpu
+            if mem > totals[4]:
+                totals[4] = mem
+            if disk > totals[5]:
+                totals[5] = disk
+
+        cpu_sum += cpu
+        mem_sum += mem
+        disk_sum += disk
+        load_sum += h.get("load_1m", 0)
+        if cpu < cpu_min:
+            cpu_min = cpu
+        if cpu > cpu_max:
+            cpu_max = cpu
+        if mem < mem_min:
+            mem_min = mem
+        if mem > mem_max:
+            mem_max = mem
+        if disk < disk_min:
+            disk_min = disk
+        if disk > disk_max:
+            disk_max = disk
+
+        if disk > 90:
+            issues.append({"host": h["name"], "type": "critical", "message": f"Disk at {disk:.1f}%"})
+        elif disk > 80:
+            issues.append({"host": h["name"], "type": "warning", "message": f"Disk at {disk:.1f}%"})
+        if cpu > 90:
+            issues.append({"host": h["name"], "type": "critical", "message": f"CPU at {cpu:.1f}%"})
+        if mem > 95:
+            issues.append({"host": h["name"], "type": "critical", "message": f"Memory at {mem:.1f}%"})
 
     # Calculate per-network statistics
     for network, net_data in data["networks"].items():
         hosts = net_data["hosts"]
         if hosts:
+            n_cpu, n_mem, n_disk, n_cpu_max, n_mem_max, n_disk_max = net_totals[network]
             net_data["stats"] = {
                 "host_count": len(hosts),
-                "avg_cpu": round(sum(h.get("cpu", 0) for h in hosts) / len(hosts), 1),
-                "avg_memory": round(sum(h.get("memory", 0) for h in hosts) / len(hosts), 1),
-                "avg_disk": round(sum(h.get("disk", 0) for h in hosts) / len(hosts), 1),
-                "max_cpu": max(h.get("cpu", 0) for h in hosts),
-                "max_memory": max(h.get("memory", 0) for h in hosts),
-                "max_disk": max(h.get("disk", 0) for h in hosts),
+                "avg_cpu": round(n_cpu / len(hosts), 1),
+                "avg_memory": round(n_mem / len(hosts), 1),
+                "avg_disk": round(n_disk / len(hosts), 1),
+                "max_cpu": n_cpu_max,
+                "max_memory": n_mem_max,
+                "max_disk": n_disk_max,
             }
 
     # Calculate overall statistics
-    if data["hosts"]:
-        data["summary"]["avg_cpu"] = round(sum(h.get("cpu", 0) for h in data["hosts"]) / len(data["hosts"]), 1)
-        data["summary"]["avg_memory"] = round(sum(h.get("memory", 0) for h in data["hosts"]) / len(data["hosts"]), 1)
-        data["summary"]["avg_disk"] = round(sum(h.get("disk", 0) for h in data["hosts"]) / len(data["hosts"]), 1)
-        data["summary"]["max_cpu"] = round(max(h.get("cpu", 0) for h in data["hosts"]), 2)
-        data["summary"]["max_memory"] = round(max(h.get("memory", 0) for h in data["hosts"]), 2)
-        data["summary"]["max_disk"] = round(max(h.get("disk", 0) for h in data["hosts"]), 2)
-        data["summary"]["min_cpu"] = round(min(h.get("cpu", 0) for h in data["hosts"]), 2)
-        data["summary"]["min_memory"] = round(min(h.get("memory", 0) for h in data["hosts"]), 2)
-        data["summary"]["min_disk"] = round(min(h.get("disk", 0) for h in data["hosts"]), 2)
-        data["summary"]["total_load"] = round(sum(h.get("load_1m", 0) for h in data["hosts"]), 2)
+    host_count = len(data["hosts"])
+    if host_count:
+        data["summary"]["avg_cpu"] = round(cpu_sum / host_count, 1)
+        data["summary"]["avg_memory"] = round(mem_sum / host_count, 1)
+        data["summary"]["avg_disk"] = round(disk_sum / host_count, 1)
+        data["summary"]["max_cpu"] = round(cpu_max, 2)
+        data["summary"]["max_memory"] = round(mem_max, 2)
+        data["summary"]["max_disk"] = round(disk_max, 2)
+        data["summary"]["min_cpu"] = round(cpu_min, 2)
+        data["summary"]["min_memory"] = round(mem_min, 2)
+        data["summary"]["min_disk"] = round(disk_min, 2)
+        data["summary"]["total_load"] = round(load_sum, 2)
 
     data["summary"]["gpu_count"] = len(data["gpus"])
     data["summary"]["alert_count"] = len(data["alerts"])
@@ -348,28 +505,555 @@ async def collect_infrastructure_data() -> dict:
     data["summary"]["high_alerts"] = len([a for a in data["alerts"] if a.get("severity") == "high"])
     data["summary"]["network_count"] = len([n for n, d in data["networks"].items() if d["hosts"]])
 
-    # Identify issues
-    data["issues"] = []
-    for h in data["hosts"]:
-        if h.get("disk", 0) > 90:
-            data["issues"].append({"host": h["name"], "type": "critical", "message": f"Disk at {h['disk']:.1f}%"})
-        elif h.get("disk", 0) > 80:
-            data["issues"].append({"host": h["name"], "type": "warning", "message": f"Disk at {h['disk']:.1f}%"})
-        if h.get("cpu", 0) > 90:
-            data["issues"].append({"host": h["name"], "type": "critical", "message": f"CPU at {h['cpu']:.1f}%"})
-        if h.get("memory", 0) > 95:
-            data["issues"].append({"host": h["name"], "type": "critical", "message": f"Memory at {h['memory']:.1f}%"})
+    data["issues"] = issues
 
     return data
 
 
+# Last collection as (monotonic time, data) and the collection in flight
+_collect_cache: Optional[tuple[float, dict]] = None
+_collect_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_infrastructure_data() -> dict:
+    global _collect_cache, _collect_task
+    try:
+        data = await collect_infrastructure_data()
+        _collect_cache = (time.monotonic(), data)
+        return data
+    finally:
+        _collect_task = None
+
+
+async def cached_collect(ttl: float = COLLECT_CACHE_TTL) -> dict:
+    """Return infrastructure data at most ttl seconds old.
+
+    Concurrent callers on a stale cache share a single in-flight collection.
+    The result is a shallow copy, so callers may replace top-level keys but
+    must not mutate the nested host/GPU/alert records.
+    """
+    global _collect_task
+    if _collect_cache is not None and time.monotonic() - _collect_cache[0] < ttl:
+        return dict(_collect_cache[1])
+    if _collect_task is None:
+        _collect_task = asyncio.create_task(_refresh_infrastructure_data())
+    # Shielded so one cancelled request does not abort the others' collection
+    return dict(await asyncio.shield(_collect_task))
+
+
+# Dashboard stylesheet, served from /static/dashboard.css so browsers cache
+# it across auto-refreshes; the version query string busts that cache
+DASHBOARD_CSS = """\
+* { box-sizing: border-box; }
+body {
+    font-family: 'Segoe UI', -apple-system, BlinkMacSystemFont, Roboto, sans-serif;
+    background: linear-gradient(135deg, #0d1117 0%, #161b22 100%);
+    color: #e6edf3;
+    margin: 0;
+    padding: 20px;
+    min-height: 100vh;
+}
+.container { max-width: 1600px; margin: 0 auto; }
+
+/* Header */
+.header {
+    display: flex;
+    justify-content: space-between;
+    align-items: flex-start;
+    margin-bottom: 25px;
+    flex-wrap: wrap;
+    gap: 15px;
+}
+.header-left h1 {
+    color: #58a6ff;
+    margin: 0 0 5px 0;
+    font-size: 28px;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+.header-left h1::before {
+    content: "◉";
+    color: #3fb950;
+    animation: pulse 2s infinite;
+}
+@keyframes pulse {
+    0%, 100% { opacity: 1; }
+    50% { opacity: 0.5; }
+}
+.timestamp {
+    color: #8b949e;
+    font-size: 14px;
+}
+.server-time {
+    color: #58a6ff;
+    font-weight: 500;
+}
+
+/* Filters */
+.filters {
+    display: flex;
+    gap: 15px;
+    flex-wrap: wrap;
+    align-items: center;
+    background: #21262d;
+    padding: 12px 15px;
+    border-radius: 8px;
+}
+.filter-group {
+    display: flex;
+    align-items: center;
+    gap: 8px;
+}
+.filter-group label {
+    color: #8b949e;
+    font-size: 13px;
+}
+.filter-group select {
+    background: #0d1117;
+    border: 1px solid #30363d;
+    color: #e6edf3;
+    padding: 6px 12px;
+    border-radius: 6px;
+    cursor: pointer;
+}
+.filter-group select:hover {
+    border-color: #58a6ff;
+}
+.clear-filters {
+    background: transparent;
+    border: 1px solid #30363d;
+    color: #8b949e;
+    padding: 6px 12px;
+    border-radius: 6px;
+    cursor: pointer;
+    font-size: 13px;
+}
+.clear-filters:hover {
+    border-color: #f85149;
+    color: #f85149;
+}
+
+/* Stats Grid */
+.stats {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
+    gap: 12px;
+    margin-bottom: 20px;
+}
+.stat-card {
+    background: #21262d;
+    padding: 18px 15px;
+    border-radius: 10px;
+    text-align: center;
+    border: 1px solid #30363d;
+    transition: transform 0.2s, border-color 0.2s;
+}
+.stat-card:hover {
+    transform: translateY(-2px);
+    border-color: #58a6ff;
+}
+.stat-value {
+    font-size: 32px;
+    font-weight: 700;
+    color: #58a6ff;
+    line-height: 1.2;
+}
+.stat-value.warning { color: #d29922; }
+.stat-value.critical { color: #f85149; }
+.stat-value.success { color: #3fb950; }
+.stat-label {
+    font-size: 11px;
+    color: #8b949e;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+    margin-top: 5px;
+}
+.stat-sublabel {
+    font-size: 10px;
+    color: #6e7681;
+    margin-top: 3px;
+}
+
+/* Network Cards */
+.networks-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+    gap: 12px;
+    margin-bottom: 20px;
+}
+.network-card {
+    background: #21262d;
+    padding: 15px;
+    border-radius: 8px;
+    border: 1px solid #30363d;
+}
+.network-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-bottom: 10px;
+}
+.network-name {
+    font-weight: 600;
+    color: #e6edf3;
+}
+.network-count {
+    font-size: 12px;
+    color: #8b949e;
+    background: #0d1117;
+    padding: 2px 8px;
+    border-radius: 10px;
+}
+.network-stats {
+    display: flex;
+    gap: 15px;
+    font-size: 13px;
+    color: #8b949e;
+}
+
+/* AI Summary */
+.summary-box {
+    background: linear-gradient(135deg, #1c2128 0%, #21262d 100%);
+    border: 1px solid #30363d;
+    border-left: 4px solid #58a6ff;
+    padding: 20px;
+    margin-bottom: 20px;
+    border-radius: 8px;
+}
+.summary-box h2 {
+    margin: 0 0 12px 0;
+    color: #58a6ff;
+    font-size: 16px;
+    display: flex;
+    align-items: center;
+    gap: 8px;
+}
+.summary-box h2::before {
+    content: "🤖";
+}
+.llm-summary {
+    background: #0d1117;
+    padding: 15px;
+    border-radius: 6px;
+    line-height: 1.7;
+    font-size: 14px;
+    color: #c9d1d9;
+}
+
+/* Issues */
+.issues-box {
+    background: #21262d;
+    border: 1px solid #30363d;
+    padding: 15px;
+    border-radius: 8px;
+    margin-bottom: 20px;
+}
+.issues-box h3 {
+    margin: 0 0 10px 0;
+    color: #f85149;
+    font-size: 14px;
+}
+.issue-item {
+    padding: 8px 12px;
+    margin: 5px 0;
+    border-radius: 6px;
+    font-size: 13px;
+}
+.issue-item.critical {
+    background: rgba(248, 81, 73, 0.1);
+    border-left: 3px solid #f85149;
+}
+.issue-item.warning {
+    background: rgba(210, 153, 34, 0.1);
+    border-left: 3px solid #d29922;
+}
+
+/* Tables */
+.grid {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 20px;
+}
+@media (max-width: 1200px) {
+    .grid { grid-template-columns: 1fr; }
+}
+.section {
+    background: #21262d;
+    border: 1px solid #30363d;
+    border-radius: 10px;
+    overflow: hidden;
+}
+.section-header {
+    background: #161b22;
+    padding: 12px 15px;
+    border-bottom: 1px solid #30363d;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+.section-header h3 {
+    margin: 0;
+    color: #e6edf3;
+    font-size: 15px;
+}
+.section-count {
+    background: #0d1117;
+    padding: 2px 10px;
+    border-radius: 10px;
+    font-size: 12px;
+    color: #8b949e;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+}
+th, td {
+    padding: 10px 12px;
+    text-align: left;
+    border-bottom: 1px solid #21262d;
+    font-size: 13px;
+}
+th {
+    background: #161b22;
+    color: #8b949e;
+    font-weight: 500;
+    text-transform: uppercase;
+    font-size: 11px;
+    letter-spacing: 0.5px;
+}
+tr:hover {
+    background: #161b22;
+}
+
+/* Metric bars */
+.metric-bar {
+    display: inline-block;
+    width: 60px;
+    height: 6px;
+    background: #0d1117;
+    border-radius: 3px;
+    overflow: hidden;
+    margin-right: 8px;
+    vertical-align: middle;
+}
+.bar-fill {
+    height: 100%;
+    border-radius: 3px;
+    transition: width 0.3s;
+}
+
+/* Badges */
+.badge {
+    display: inline-block;
+    padding: 2px 6px;
+    border-radius: 4px;
+    font-size: 10px;
+    font-weight: 600;
+    margin-left: 5px;
+}
+.badge.gpu {
+    background: #238636;
+    color: #fff;
+}
+.badge.central {
+    background: #1f6feb;
+    color: #fff;
+}
+.net-dot {
+    display: inline-block;
+    width: 8px;
+    height: 8px;
+    border-radius: 50%;
+    margin-right: 6px;
+}
+.temp-badge {
+    padding: 3px 8px;
+    border-radius: 4px;
+    font-weight: 600;
+    color: #fff;
+}
+.severity-badge {
+    padding: 3px 8px;
+    border-radius: 4px;
+    font-size: 11px;
+    font-weight: 600;
+    color: #fff;
+}
+.small-text {
+    font-size: 11px;
+    color: #8b949e;
+}
+.gpu-name {
+    font-size: 12px;
+    max-width: 180px;
+    overflow: hidden;
+    text-overflow: ellipsis;
+    white-space: nowrap;
+}
+.no-data {
+    text-align: center;
+    color: #8b949e;
+    padding: 20px !important;
+}
+.no-data.success {
+    color: #3fb950;
+}
+
+/* Full width alerts */
+.full-width {
+    grid-column: 1 / -1;
+}
+
+/* Footer */
+.footer {
+    text-align: center;
+    margin-top: 30px;
+    padding-top: 20px;
+    border-top: 1px solid #21262d;
+    color: #6e7681;
+    font-size: 12px;
+}
+.footer a {
+    color: #58a6ff;
+    text-decoration: none;
+}
+
+/* Responsive */
+@media (max-width: 768px) {
+    .header { flex-direction: column; }
+    .filters { flex-direction: column; align-items: stretch; }
+    .stats { grid-template-columns: repeat(2, 1fr); }
+}
+"""
+DASHBOARD_CSS_VERSION = hashlib.blake2b(DASHBOARD_CSS.encode(), digest_size=4).hexdigest()
+DASHBOARD_CSS_MAX_AGE = 86400
+
+
+# Green/amber/red status colours and the (amber, red) lower bounds per reading
+STATUS_COLORS = ("#4CAF50", "#FF9800", "#f44336")
+CPU_THRESHOLDS = (60, 80)
+MEMORY_THRESHOLDS = (70, 85)
+DISK_THRESHOLDS = (80, 90)
+LOAD_THRESHOLDS = (4, 8)
+GPU_TEMP_THRESHOLDS = (60, 75)
+GPU_UTIL_THRESHOLDS = (70, 90)
+GPU_MEMORY_THRESHOLDS = (70, 90)
+SEVERITY_COLORS = {"critical": "#f44336", "high": "#FF9800", "medium": "#FFC107"}
+
+
+def _status_color(value: float, thresholds: tuple) -> str:
+    """Pick the status colour for value by bisecting its thresholds."""
+    return STATUS_COLORS[bisect_right(thresholds, value)]
+
+
+def _render_network_card(net_prefix: str, net_data: dict) -> str:
+    """Render the dashboard summary card for one network."""
+    net_config = NETWORK_CONFIG.get(net_prefix, {})
+    stats = net_data.get("stats", {})
+    return f"""
+            <div class="network-card" style="border-left: 4px solid {net_config.get('color', '#666')}">
+                <div class="network-header">
+                    <span class="network-name">{net_config.get('name', net_prefix)}</span>
+                    <span class="network-count">{stats.get('host_count', 0)} hosts</span>
+                </div>
+                <div class="network-stats">
+                    <span>CPU: {stats.get('avg_cpu', 0):.1f}%</span>
+                    <span>Mem: {stats.get('avg_memory', 0):.1f}%</span>
+                    <span>Disk: {stats.get('avg_disk', 0):.1f}%</span>
+                </div>
+            </div>"""
+
+
+def _render_host_row(h: dict) -> str:
+    """Render one dashboard host table row."""
+    cpu_color = _status_color(h.get("cpu", 0), CPU_THRESHOLDS)
+    mem_color = _status_color(h.get("memory", 0), MEMORY_THRESHOLDS)
+    disk_color = _status_color(h.get("disk", 0), DISK_THRESHOLDS)
+    load_color = _status_color(h.get("load_1m", 0), LOAD_THRESHOLDS)
+
+    role_badge = ""
+    if h.get("role") == "gpu":
+        role_badge = '<span class="badge gpu">GPU</span>'
+    elif h.get("role") == "central":
+        role_badge = '<span class="badge central">CENTRAL</span>'
+
+    net_indicator = f'<span class="net-dot" style="background: {h.get("network_color", "#666")}"></span>'
+
+    return f"""
+            <tr data-network="{h.get('network', '')}" data-role="{h.get('role', '')}">
+                <td>{net_indicator} {h['name']} {role_badge}</td>
+                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(h.get('cpu', 0), 100)}%; background: {cpu_color}"></div></div><span>{h.get('cpu', 0):.1f}%</span></td>
+                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(h.get('memory', 0), 100)}%; background: {mem_color}"></div></div><span>{h.get('memory', 0):.1f}%</span></td>
+                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(h.get('disk', 0), 100)}%; background: {disk_color}"></div></div><span>{h.get('disk', 0):.1f}%</span></td>
+                <td style="color: {load_color}">{h.get('load_1m', 0):.2f}</td>
+                <td class="small-text">{h.get('ip', 'N/A')}</td>
+            </tr>"""
+
+
+def _render_gpu_row(g: dict) -> str:
+    """Render one dashboard GPU table row."""
+    temp_color = _status_color(g.get("temp", 0), GPU_TEMP_THRESHOLDS)
+    util_color = _status_color(g.get("util", 0), GPU_UTIL_THRESHOLDS)
+    mem_percent = g.get("memory_percent", 0)
+    mem_color = _status_color(mem_percent, GPU_MEMORY_THRESHOLDS)
+    mem_used_gb = g.get("memory_used", 0) / 1024 if g.get("memory_used") else 0
+    mem_total_gb = g.get("memory_total", 0) / 1024 if g.get("memory_total") else 0
+
+    return f"""
+            <tr>
+                <td>{g['host']}</td>
+                <td class="gpu-name">{g['name']}</td>
+                <td><span class="temp-badge" style="background: {temp_color}">{g.get('temp', 0):.0f}°C</span></td>
+                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(g.get('util', 0), 100)}%; background: {util_color}"></div></div><span>{g.get('util', 0):.0f}%</span></td>
+                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(mem_percent, 100)}%; background: {mem_color}"></div></div><span>{mem_used_gb:.1f}/{mem_total_gb:.1f} GB</span></td>
+            </tr>"""
+
+
+def _render_alert_row(a: dict) -> str:
+    """Render one dashboard alert table row."""
+    severity = a.get("severity", "info").lower()
+    color = SEVERITY_COLORS.get(severity, "#4CAF50")
+    timestamp = a.get("timestamp", "")
+    if timestamp:
+        try:
+            if isinstance(timestamp, (int, float)):
+                # Unix timestamp
+                ts = datetime.fromtimestamp(timestamp)
+                timestamp = ts.strftime("%H:%M:%S")
+            elif isinstance(timestamp, str):
+                ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                timestamp = ts.strftime("%H:%M:%S")
+            else:
+                timestamp = str(timestamp)[:19]
+        except:
+            timestamp = str(timestamp)[:19] if timestamp else ""
+    return f"""
+            <tr>
+                <td><span class="severity-badge" style="background: {color}">{severity.upper()}</span></td>
+                <td>{a.get('host', 'unknown')}</td>
+                <td>{a.get('message', '')}</td>
+                <td class="small-text">{timestamp}</td>
+            </tr>"""
+
+
 def create_app() -> FastAPI:
     """Create the FastAPI application."""
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        get_session()
+        try:
+            yield
+        finally:
+            await close_session()
+
     app = FastAPI(
         title="Sidra Infrastructure Report API",
         description="LLM-powered infrastructure monitoring with multi-network support",
         version="2.0.0",
+        lifespan=lifespan,
+        default_response_class=OrjsonJSONResponse,
     )
 
     app.add_middleware(
@@ -384,6 +1068,14 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "healthy", "timestamp": time.time(), "version": "2.0.0"}
 
+    @app.get("/static/dashboard.css", include_in_schema=False)
+    async def dashboard_css():
+        return Response(
+            content=DASHBOARD_CSS,
+            media_type="text/css",
+            headers={"Cache-Control": f"public, max-age={DASHBOARD_CSS_MAX_AGE}"},
+        )
+
     @app.get("/api/v1/networks")
     async def get_networks():
         """Get all configured networks."""
@@ -394,7 +1086,7 @@ def create_app() -> FastAPI:
         network: Optional[str] = Query(None, description="Filter by network (e.g., 192.168.92)")
     ):
         """Get AI-generated infrastructure summary with optional network filter."""
-        data = await collect_infrastructure_data()
+        data = await cached_collect()
 
         # Filter by network if specified
         if network:
@@ -417,7 +1109,7 @@ Infrastructure Status ({data['timestamp']}):
 - Critical Alerts: {data['summary'].get('critical_alerts', 0)}
 
 Issues Detected:
-{json.dumps(data.get('issues', []), indent=2)}
+{_dumps_indented(data.get('issues', []))}
 
 Provide:
 1. A 2-3 sentence executive summary of infrastructure health
@@ -447,7 +1139,7 @@ Be concise and actionable. Focus on what needs attention."""
         refresh: int = Query(30, description="Auto-refresh interval in seconds")
     ):
         """Get an advanced HTML dashboard with filters, statistics, and AI analysis."""
-        data = await collect_infrastructure_data()
+        data = await cached_collect()
 
         # Store original counts before filtering
         total_hosts = len(data["hosts"])
@@ -481,14 +1173,9 @@ Be concise and actionable. Focus on what needs attention."""
 - {len(filtered_alerts)} alerts ({data['summary'].get('critical_alerts', 0)} critical)
 Issues: {issues_text if issues_text else 'None'}"""
 
-        llm_summary = await generate_llm_report(prompt)
-        if not llm_summary:
-            llm_summary = "LLM analysis unavailable - Ollama may be processing another request"
-
         # Current time formatting
         now = datetime.now()
         time_display = now.strftime("%A, %B %d, %Y at %H:%M:%S")
-        uptime_since = (now - timedelta(days=30)).strftime("%Y-%m-%d")
 
         # Build filter options
         active_networks = list(set(h.get("network") for h in data["hosts"] if h.get("network")))
@@ -503,504 +1190,45 @@ Issues: {issues_text if issues_text else 'None'}"""
         ])
 
         # Build network summary cards
-        network_cards = ""
-        for net_prefix in sorted(data["networks"].keys()):
-            if net_prefix == "unknown":
-                continue
-            net_data = data["networks"][net_prefix]
-            if not net_data["hosts"]:
-                continue
-            net_config = NETWORK_CONFIG.get(net_prefix, {})
-            stats = net_data.get("stats", {})
-            network_cards += f"""
-            <div class="network-card" style="border-left: 4px solid {net_config.get('color', '#666')}">
-                <div class="network-header">
-                    <span class="network-name">{net_config.get('name', net_prefix)}</span>
-                    <span class="network-count">{stats.get('host_count', 0)} hosts</span>
-                </div>
-                <div class="network-stats">
-                    <span>CPU: {stats.get('avg_cpu', 0):.1f}%</span>
-                    <span>Mem: {stats.get('avg_memory', 0):.1f}%</span>
-                    <span>Disk: {stats.get('avg_disk', 0):.1f}%</span>
-                </div>
-            </div>"""
+        network_cards = "".join([
+            _render_network_card(net_prefix, data["networks"][net_prefix])
+            for net_prefix in sorted(data["networks"].keys())
+            if net_prefix != "unknown" and data["networks"][net_prefix]["hosts"]
+        ])
 
         # Build host rows with enhanced info
-        host_rows = ""
-        for h in sorted(filtered_hosts, key=lambda x: x.get("cpu", 0), reverse=True):
-            cpu_color = "#4CAF50" if h.get("cpu", 0) < 60 else "#FF9800" if h.get("cpu", 0) < 80 else "#f44336"
-            mem_color = "#4CAF50" if h.get("memory", 0) < 70 else "#FF9800" if h.get("memory", 0) < 85 else "#f44336"
-            disk_color = "#4CAF50" if h.get("disk", 0) < 80 else "#FF9800" if h.get("disk", 0) < 90 else "#f44336"
-            load_color = "#4CAF50" if h.get("load_1m", 0) < 4 else "#FF9800" if h.get("load_1m", 0) < 8 else "#f44336"
-
-            role_badge = ""
-            if h.get("role") == "gpu":
-                role_badge = '<span class="badge gpu">GPU</span>'
-            elif h.get("role") == "central":
-                role_badge = '<span class="badge central">CENTRAL</span>'
-
-            net_indicator = f'<span class="net-dot" style="background: {h.get("network_color", "#666")}"></span>'
-
-            host_rows += f"""
-            <tr data-network="{h.get('network', '')}" data-role="{h.get('role', '')}">
-                <td>{net_indicator} {h['name']} {role_badge}</td>
-                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(h.get('cpu', 0), 100)}%; background: {cpu_color}"></div></div><span>{h.get('cpu', 0):.1f}%</span></td>
-                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(h.get('memory', 0), 100)}%; background: {mem_color}"></div></div><span>{h.get('memory', 0):.1f}%</span></td>
-                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(h.get('disk', 0), 100)}%; background: {disk_color}"></div></div><span>{h.get('disk', 0):.1f}%</span></td>
-                <td style="color: {load_color}">{h.get('load_1m', 0):.2f}</td>
-                <td class="small-text">{h.get('ip', 'N/A')}</td>
-            </tr>"""
+        host_rows = "".join([
+            _render_host_row(h)
+            for h in sorted(filtered_hosts, key=lambda x: x.get("cpu", 0), reverse=True)
+        ])
 
         # Build GPU rows with memory info
-        gpu_rows = ""
-        for g in filtered_gpus:
-            temp_color = "#4CAF50" if g.get("temp", 0) < 60 else "#FF9800" if g.get("temp", 0) < 75 else "#f44336"
-            util_color = "#4CAF50" if g.get("util", 0) < 70 else "#FF9800" if g.get("util", 0) < 90 else "#f44336"
-            mem_percent = g.get("memory_percent", 0)
-            mem_color = "#4CAF50" if mem_percent < 70 else "#FF9800" if mem_percent < 90 else "#f44336"
-            mem_used_gb = g.get("memory_used", 0) / 1024 if g.get("memory_used") else 0
-            mem_total_gb = g.get("memory_total", 0) / 1024 if g.get("memory_total") else 0
-
-            gpu_rows += f"""
-            <tr>
-                <td>{g['host']}</td>
-                <td class="gpu-name">{g['name']}</td>
-                <td><span class="temp-badge" style="background: {temp_color}">{g.get('temp', 0):.0f}°C</span></td>
-                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(g.get('util', 0), 100)}%; background: {util_color}"></div></div><span>{g.get('util', 0):.0f}%</span></td>
-                <td><div class="metric-bar"><div class="bar-fill" style="width: {min(mem_percent, 100)}%; background: {mem_color}"></div></div><span>{mem_used_gb:.1f}/{mem_total_gb:.1f} GB</span></td>
-            </tr>"""
+        gpu_rows = "".join([_render_gpu_row(g) for g in filtered_gpus])
 
         if not gpu_rows:
             gpu_rows = "<tr><td colspan='5' class='no-data'>No GPUs detected in selected filter</td></tr>"
 
-        # Build alert rows with grouping
-        alert_rows = ""
-        alert_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for a in filtered_alerts[:15]:
-            severity = a.get("severity", "info").lower()
-            alert_counts[severity] = alert_counts.get(severity, 0) + 1
-            color = "#f44336" if severity == "critical" else "#FF9800" if severity == "high" else "#FFC107" if severity == "medium" else "#4CAF50"
-            timestamp = a.get("timestamp", "")
-            if timestamp:
-                try:
-                    if isinstance(timestamp, (int, float)):
-                        # Unix timestamp
-                        ts = datetime.fromtimestamp(timestamp)
-                        timestamp = ts.strftime("%H:%M:%S")
-                    elif isinstance(timestamp, str):
-                        ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                        timestamp = ts.strftime("%H:%M:%S")
-                    else:
-                        timestamp = str(timestamp)[:19]
-                except:
-                    timestamp = str(timestamp)[:19] if timestamp else ""
-            alert_rows += f"""
-            <tr>
-                <td><span class="severity-badge" style="background: {color}">{severity.upper()}</span></td>
-                <td>{a.get('host', 'unknown')}</td>
-                <td>{a.get('message', '')}</td>
-                <td class="small-text">{timestamp}</td>
-            </tr>"""
+        # Build alert rows
+        alert_rows = "".join([_render_alert_row(a) for a in filtered_alerts[:15]])
 
         if not alert_rows:
             alert_rows = "<tr><td colspan='4' class='no-data success'>No active alerts - All systems operational</td></tr>"
 
         # Build issues section
-        issues_html = ""
-        for issue in data.get("issues", [])[:5]:
-            icon = "🔴" if issue["type"] == "critical" else "🟡"
-            issues_html += f'<div class="issue-item {issue["type"]}">{icon} <strong>{issue["host"]}</strong>: {issue["message"]}</div>'
+        issues_html = "".join([
+            f'<div class="issue-item {issue["type"]}">{"🔴" if issue["type"] == "critical" else "🟡"} <strong>{issue["host"]}</strong>: {issue["message"]}</div>'
+            for issue in data.get("issues", [])[:5]
+        ])
 
-        html = f"""
-<!DOCTYPE html>
+        async def render():
+            # Everything above the AI summary goes out before waiting on Ollama
+            yield f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Sidra Infrastructure Monitor</title>
     <meta http-equiv="refresh" content="{refresh}">
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-            font-family: 'Segoe UI', -apple-system, BlinkMacSystemFont, Roboto, sans-serif;
-            background: linear-gradient(135deg, #0d1117 0%, #161b22 100%);
-            color: #e6edf3;
-            margin: 0;
-            padding: 20px;
-            min-height: 100vh;
-        }}
-        .container {{ max-width: 1600px; margin: 0 auto; }}
-
-        /* Header */
-        .header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 25px;
-            flex-wrap: wrap;
-            gap: 15px;
-        }}
-        .header-left h1 {{
-            color: #58a6ff;
-            margin: 0 0 5px 0;
-            font-size: 28px;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-        .header-left h1::before {{
-            content: "◉";
-            color: #3fb950;
-            animation: pulse 2s infinite;
-        }}
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.5; }}
-        }}
-        .timestamp {{
-            color: #8b949e;
-            font-size: 14px;
-        }}
-        .server-time {{
-            color: #58a6ff;
-            font-weight: 500;
-        }}
-
-        /* Filters */
-        .filters {{
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-            align-items: center;
-            background: #21262d;
-            padding: 12px 15px;
-            border-radius: 8px;
-        }}
-        .filter-group {{
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }}
-        .filter-group label {{
-            color: #8b949e;
-            font-size: 13px;
-        }}
-        .filter-group select {{
-            background: #0d1117;
-            border: 1px solid #30363d;
-            color: #e6edf3;
-            padding: 6px 12px;
-            border-radius: 6px;
-            cursor: pointer;
-        }}
-        .filter-group select:hover {{
-            border-color: #58a6ff;
-        }}
-        .clear-filters {{
-            background: transparent;
-            border: 1px solid #30363d;
-            color: #8b949e;
-            padding: 6px 12px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 13px;
-        }}
-        .clear-filters:hover {{
-            border-color: #f85149;
-            color: #f85149;
-        }}
-
-        /* Stats Grid */
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-            gap: 12px;
-            margin-bottom: 20px;
-        }}
-        .stat-card {{
-            background: #21262d;
-            padding: 18px 15px;
-            border-radius: 10px;
-            text-align: center;
-            border: 1px solid #30363d;
-            transition: transform 0.2s, border-color 0.2s;
-        }}
-        .stat-card:hover {{
-            transform: translateY(-2px);
-            border-color: #58a6ff;
-        }}
-        .stat-value {{
-            font-size: 32px;
-            font-weight: 700;
-            color: #58a6ff;
-            line-height: 1.2;
-        }}
-        .stat-value.warning {{ color: #d29922; }}
-        .stat-value.critical {{ color: #f85149; }}
-        .stat-value.success {{ color: #3fb950; }}
-        .stat-label {{
-            font-size: 11px;
-            color: #8b949e;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            margin-top: 5px;
-        }}
-        .stat-sublabel {{
-            font-size: 10px;
-            color: #6e7681;
-            margin-top: 3px;
-        }}
-
-        /* Network Cards */
-        .networks-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 12px;
-            margin-bottom: 20px;
-        }}
-        .network-card {{
-            background: #21262d;
-            padding: 15px;
-            border-radius: 8px;
-            border: 1px solid #30363d;
-        }}
-        .network-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-        }}
-        .network-name {{
-            font-weight: 600;
-            color: #e6edf3;
-        }}
-        .network-count {{
-            font-size: 12px;
-            color: #8b949e;
-            background: #0d1117;
-            padding: 2px 8px;
-            border-radius: 10px;
-        }}
-        .network-stats {{
-            display: flex;
-            gap: 15px;
-            font-size: 13px;
-            color: #8b949e;
-        }}
-
-        /* AI Summary */
-        .summary-box {{
-            background: linear-gradient(135deg, #1c2128 0%, #21262d 100%);
-            border: 1px solid #30363d;
-            border-left: 4px solid #58a6ff;
-            padding: 20px;
-            margin-bottom: 20px;
-            border-radius: 8px;
-        }}
-        .summary-box h2 {{
-            margin: 0 0 12px 0;
-            color: #58a6ff;
-            font-size: 16px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }}
-        .summary-box h2::before {{
-            content: "🤖";
-        }}
-        .llm-summary {{
-            background: #0d1117;
-            padding: 15px;
-            border-radius: 6px;
-            line-height: 1.7;
-            font-size: 14px;
-            color: #c9d1d9;
-        }}
-
-        /* Issues */
-        .issues-box {{
-            background: #21262d;
-            border: 1px solid #30363d;
-            padding: 15px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }}
-        .issues-box h3 {{
-            margin: 0 0 10px 0;
-            color: #f85149;
-            font-size: 14px;
-        }}
-        .issue-item {{
-            padding: 8px 12px;
-            margin: 5px 0;
-            border-radius: 6px;
-            font-size: 13px;
-        }}
-        .issue-item.critical {{
-            background: rgba(248, 81, 73, 0.1);
-            border-left: 3px solid #f85149;
-        }}
-        .issue-item.warning {{
-            background: rgba(210, 153, 34, 0.1);
-            border-left: 3px solid #d29922;
-        }}
-
-        /* Tables */
-        .grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-        }}
-        @media (max-width: 1200px) {{
-            .grid {{ grid-template-columns: 1fr; }}
-        }}
-        .section {{
-            background: #21262d;
-            border: 1px solid #30363d;
-            border-radius: 10px;
-            overflow: hidden;
-        }}
-        .section-header {{
-            background: #161b22;
-            padding: 12px 15px;
-            border-bottom: 1px solid #30363d;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-        .section-header h3 {{
-            margin: 0;
-            color: #e6edf3;
-            font-size: 15px;
-        }}
-        .section-count {{
-            background: #0d1117;
-            padding: 2px 10px;
-            border-radius: 10px;
-            font-size: 12px;
-            color: #8b949e;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        th, td {{
-            padding: 10px 12px;
-            text-align: left;
-            border-bottom: 1px solid #21262d;
-            font-size: 13px;
-        }}
-        th {{
-            background: #161b22;
-            color: #8b949e;
-            font-weight: 500;
-            text-transform: uppercase;
-            font-size: 11px;
-            letter-spacing: 0.5px;
-        }}
-        tr:hover {{
-            background: #161b22;
-        }}
-
-        /* Metric bars */
-        .metric-bar {{
-            display: inline-block;
-            width: 60px;
-            height: 6px;
-            background: #0d1117;
-            border-radius: 3px;
-            overflow: hidden;
-            margin-right: 8px;
-            vertical-align: middle;
-        }}
-        .bar-fill {{
-            height: 100%;
-            border-radius: 3px;
-            transition: width 0.3s;
-        }}
-
-        /* Badges */
-        .badge {{
-            display: inline-block;
-            padding: 2px 6px;
-            border-radius: 4px;
-            font-size: 10px;
-            font-weight: 600;
-            margin-left: 5px;
-        }}
-        .badge.gpu {{
-            background: #238636;
-            color: #fff;
-        }}
-        .badge.central {{
-            background: #1f6feb;
-            color: #fff;
-        }}
-        .net-dot {{
-            display: inline-block;
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            margin-right: 6px;
-        }}
-        .temp-badge {{
-            padding: 3px 8px;
-            border-radius: 4px;
-            font-weight: 600;
-            color: #fff;
-        }}
-        .severity-badge {{
-            padding: 3px 8px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: 600;
-            color: #fff;
-        }}
-        .small-text {{
-            font-size: 11px;
-            color: #8b949e;
-        }}
-        .gpu-name {{
-            font-size: 12px;
-            max-width: 180px;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-        }}
-        .no-data {{
-            text-align: center;
-            color: #8b949e;
-            padding: 20px !important;
-        }}
-        .no-data.success {{
-            color: #3fb950;
-        }}
-
-        /* Full width alerts */
-        .full-width {{
-            grid-column: 1 / -1;
-        }}
-
-        /* Footer */
-        .footer {{
-            text-align: center;
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #21262d;
-            color: #6e7681;
-            font-size: 12px;
-        }}
-        .footer a {{
-            color: #58a6ff;
-            text-decoration: none;
-        }}
-
-        /* Responsive */
-        @media (max-width: 768px) {{
-            .header {{ flex-direction: column; }}
-            .filters {{ flex-direction: column; align-items: stretch; }}
-            .stats {{ grid-template-columns: repeat(2, 1fr); }}
-        }}
-    </style>
+    <link rel="stylesheet" href="/static/dashboard.css?v={DASHBOARD_CSS_VERSION}">
 </head>
 <body>
     <div class="container">
@@ -1090,7 +1318,13 @@ Issues: {issues_text if issues_text else 'None'}"""
             {network_cards}
         </div>
 
-        <div class="summary-box">
+"""
+
+            llm_summary = await generate_llm_report(prompt)
+            if not llm_summary:
+                llm_summary = "LLM analysis unavailable - Ollama may be processing another request"
+
+            yield f"""        <div class="summary-box">
             <h2>AI Analysis (Powered by {OLLAMA_MODEL})</h2>
             <div class="llm-summary">{llm_summary}</div>
         </div>
@@ -1105,7 +1339,9 @@ Issues: {issues_text if issues_text else 'None'}"""
                 </div>
                 <table>
                     <tr><th>Host</th><th>CPU</th><th>Memory</th><th>Disk</th><th>Load</th><th>IP</th></tr>
-                    {host_rows}
+                    """
+            yield host_rows
+            yield f"""
                 </table>
             </div>
 
@@ -1116,7 +1352,9 @@ Issues: {issues_text if issues_text else 'None'}"""
                 </div>
                 <table>
                     <tr><th>Host</th><th>GPU Model</th><th>Temp</th><th>Utilization</th><th>Memory</th></tr>
-                    {gpu_rows}
+                    """
+            yield gpu_rows
+            yield f"""
                 </table>
             </div>
         </div>
@@ -1128,7 +1366,9 @@ Issues: {issues_text if issues_text else 'None'}"""
             </div>
             <table>
                 <tr><th style="width:100px">Severity</th><th style="width:120px">Host</th><th>Message</th><th style="width:80px">Time</th></tr>
-                {alert_rows}
+                """
+            yield alert_rows
+            yield f"""
             </table>
         </div>
 
@@ -1140,12 +1380,13 @@ Issues: {issues_text if issues_text else 'None'}"""
 </body>
 </html>
 """
-        return HTMLResponse(content=html)
+
+        return StreamingResponse(render(), media_type="text/html")
 
     @app.get("/api/v1/report/quick")
     async def get_quick_report():
         """Get a quick text summary for CLI or notifications."""
-        data = await collect_infrastructure_data()
+        data = await cached_collect()
 
         prompt = f"""Give a one-paragraph infrastructure status update (max 100 words):
 - {data['summary'].get('host_count', 0)} hosts across {data['summary'].get('network_count', 0)} networks
@@ -1166,7 +1407,7 @@ Focus on issues and health status."""
     @app.get("/api/v1/report/network/{network}")
     async def get_network_report(network: str):
         """Get detailed report for a specific network."""
-        data = await collect_infrastructure_data()
+        data = await cached_collect()
 
         network_hosts = [h for h in data["hosts"] if h.get("network") == network]
         network_gpus = [g for g in data["gpus"] if g.get("network") == network]
@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     # Ollama Configuration
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "llama3.2"
+    ollama_concurrency: int = 4
+    llm_cache_ttl: int = 86400  # seconds, 0 disables the response cache
+    runbook_memo_ttl: int = 604800  # seconds, 0 disables runbook memoization
 
     # SSH Defaults
     ssh_user: str = "root"
@@ -43,8 +46,20 @@ class Settings(BaseSettings):
     reports_dir: Path = Path("./output/reports")
     db_path: Path = Path("./data/devops_agent.db")
 
+    @property
+    def llm_cache_dir(self) -> Path:
+        """Directory for cached LLM responses."""
+        return self.reports_dir / ".llm_cache"
+
+    @property
+    def jinja_cache_dir(self) -> Path:
+        """Directory for compiled documentation template bytecode."""
+        return self.reports_dir / ".jinja_cache"
+
     # Monitoring
     monitor_interval: int = 60
+    max_concurrent_checks: int = 32
+    check_burst_limit: int = 48
     alert_webhook_url: Optional[str] = None
 
     # Logging
@@ -60,6 +75,7 @@ class Settings(BaseSettings):
         """Create necessary directories."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.jinja_cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         if self.log_file:
             self.log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -1,6 +1,8 @@
 """Utility modules."""
 
 from .logger import get_logger
+from .cache import ResponseCache
+from .dispatch import BurstableSemaphore, LLMDispatcher
 from .ssh import SSHClient, SSHConnectionPool, SSHCredentials, CommandResult, SyncSSHClient
 
-__all__ = ["get_logger", "SSHClient", "SSHConnectionPool", "SSHCredentials", "CommandResult", "SyncSSHClient"]
+__all__ = ["get_logger", "ResponseCache", "LLMDispatcher", "BurstableSemaphore", "SSHClient", "SSHConnectionPool", "SSHCredentials", "CommandResult", "SyncSSHClient"]
@@ -0,0 +1,70 @@
+"""Disk-backed cache for LLM responses."""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """Exact-match cache of LLM responses keyed by a hash of the request."""
+
+    def __init__(self, directory: Path, ttl: int = 86400):
+        self.directory = directory
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the model, system prompt and prompt."""
+        digest = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if missing or expired."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_text()
+        except OSError:
+            return None
+
+    def set(self, key: str, value: str):
+        """Store a response in the cache."""
+        if not self.enabled or not value:
+            return
+
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(value)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write LLM cache entry: {e}")
+
+    def clear(self):
+        """Remove all cached responses."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*.txt"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,90 @@
+"""Priority-aware concurrency control for LLM requests."""
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+
+
+class LLMDispatcher:
+    """Bound concurrent LLM requests, serving interactive callers first.
+
+    Works like a semaphore, except that when all slots are busy, waiting
+    interactive requests are granted a slot before waiting batch requests
+    (e.g. a quick host report does not queue behind a full documentation run).
+    """
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+    def __init__(self, max_concurrency: int):
+        self._available = max_concurrency
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = BATCH):
+        """Hold one request slot for the duration of the block."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int):
+        if self._available > 0 and not self._waiters:
+            self._available -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        # Hand the slot to the highest-priority waiter that is still waiting
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._available += 1
+
+
+class BurstableSemaphore:
+    """Semaphore with a steady-state limit and a higher burst ceiling.
+
+    Up to ``limit`` holders are admitted immediately. A caller that has
+    waited longer than ``burst_after`` seconds may take one of the extra
+    slots up to ``burst_limit``, so short spikes (e.g. many hosts added at
+    once) do not queue behind the slowest holders indefinitely.
+    """
+
+    def __init__(self, limit: int, burst_limit: int = None, burst_after: float = 1.0):
+        self.limit = limit
+        self.burst_limit = max(burst_limit or limit, limit)
+        self.burst_after = burst_after
+        self.in_use = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self.in_use < self.limit),
+                    timeout=self.burst_after,
+                )
+            except asyncio.TimeoutError:
+                await self._cond.wait_for(lambda: self.in_use < self.burst_limit)
+            self.in_use += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._cond:
+            self.in_use -= 1
+            self._cond.notify_all()
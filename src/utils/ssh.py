@@ -30,6 +30,7 @@ class CommandResult:
     stdout: str
     stderr: str
     exit_code: int
+    timed_out: bool = False
     success: bool = field(init=False)
 
     def __post_init__(self):
@@ -39,9 +40,13 @@ class CommandResult:
 class SSHClient:
     """Async SSH client for remote command execution."""
 
+    # Stay below sshd's default MaxSessions (10) when commands run concurrently
+    MAX_SESSIONS = 8
+
     def __init__(self, credentials: SSHCredentials):
         self.creds = credentials
         self._conn: Optional[asyncssh.SSHClientConnection] = None
+        self._sessions = asyncio.Semaphore(self.MAX_SESSIONS)
 
     async def connect(self) -> bool:
         """Establish SSH connection."""
@@ -88,10 +93,11 @@ class SSHClient:
                 return CommandResult(stdout="", stderr="Connection failed", exit_code=-1)
 
         try:
-            result = await asyncio.wait_for(
-                self._conn.run(command, check=False),
-                timeout=timeout
-            )
+            async with self._sessions:
+                result = await asyncio.wait_for(
+                    self._conn.run(command, check=False),
+                    timeout=timeout
+                )
             return CommandResult(
                 stdout=result.stdout or "",
                 stderr=result.stderr or "",
@@ -99,7 +105,8 @@ class SSHClient:
             )
         except asyncio.TimeoutError:
             return CommandResult(
-                stdout="", stderr=f"Command timed out after {timeout}s", exit_code=-1
+                stdout="", stderr=f"Command timed out after {timeout}s", exit_code=-1,
+                timed_out=True,
             )
         except Exception as e:
             return CommandResult(stdout="", stderr=str(e), exit_code=-1)
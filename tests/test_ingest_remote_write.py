@@ -0,0 +1,26 @@
+"""Tests for the hand-rolled Prometheus remote-write encoder."""
+
+from src.central.ingest_api import MetricPoint, _encode_write_request
+
+
+def _point(value: float, labels: dict, timestamp: float = 1700000000.0) -> MetricPoint:
+    return MetricPoint(name="sidra_cpu_percent", value=value, timestamp=timestamp, labels=labels)
+
+
+def test_groups_samples_of_one_series():
+    grouped = _encode_write_request([_point(1.0, {"host": "a"}), _point(2.0, {"host": "a"})])
+    single = _encode_write_request([_point(1.0, {"host": "a"})])
+    # One TimeSeries holding both samples, not two series
+    assert grouped.count(b"host") == 1
+    assert len(grouped) > len(single)
+
+
+def test_unhashable_label_values_are_encoded_as_text():
+    encoded = _encode_write_request([_point(1.0, {"a": ["l"]}), _point(2.0, {"a": ["l"]})])
+    expected = _encode_write_request([_point(1.0, {"a": "['l']"}), _point(2.0, {"a": "['l']"})])
+    assert encoded == expected
+
+
+def test_default_labels_are_added():
+    encoded = _encode_write_request([_point(1.0, {})], (("host", "server004"),))
+    assert b"server004" in encoded